@@ -18,7 +18,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from contextlib import asynccontextmanager
+from collections.abc import Coroutine
+from contextlib import AsyncExitStack, asynccontextmanager
 from importlib.metadata import version
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, AsyncGenerator
@@ -50,8 +51,18 @@ from .runner import AgentRunner, discover_runners, load_runner
 if TYPE_CHECKING:
     from .models import AFMRecord
 
+try:
+    # libuv-based event loop, faster on network I/O. uvicorn.run() picks it
+    # up on its own; this covers the loops the CLI creates itself
+    from uvloop import new_event_loop as _new_event_loop
+except ImportError:  # uvloop not installed (or Windows)
+    _new_event_loop = None
+
 logger = logging.getLogger(__name__)
 
+# Quieted to WARNING unless running with --verbose
+_HTTP_CLIENT_LOGGERS = (logging.getLogger("httpx"), logging.getLogger("httpcore"))
+
 
 def create_unified_app(
     agent: AgentRunner,
@@ -61,10 +72,14 @@ def create_unified_app(
     startup_event: asyncio.Event | None = None,
     host: str = "0.0.0.0",
     port: int = DEFAULT_HTTP_PORT,
+    enable_docs: bool = False,
 ) -> FastAPI:
     if webchat_interface is None and webhook_interface is None:
         raise ValueError("At least one HTTP interface must be provided")
 
+    webchat_path = get_http_path(webchat_interface) if webchat_interface else None
+    webhook_path = get_http_path(webhook_interface) if webhook_interface else None
+
     # Set up WebSub subscriber if configured
     websub_subscriber: WebSubSubscriber | None = None
     secret: str | None = None
@@ -74,8 +89,6 @@ def create_unified_app(
         secret = subscription.secret
 
         if subscription.hub and subscription.topic:
-            webhook_path = get_http_path(webhook_interface)
-
             # Determine callback URL - use localhost for 0.0.0.0 since it's not externally routable
             if subscription.callback:
                 callback_url = subscription.callback
@@ -105,49 +118,55 @@ def create_unified_app(
         # Connect MCP servers on startup
         await agent.connect()
 
-        # Startup: Subscribe to WebSub hub
-        if websub_subscriber:
-            # Run subscription in background
-            subscription_task = asyncio.create_task(
-                subscribe_with_retry(websub_subscriber)
-            )
-            subscription_task.add_done_callback(log_task_exception)
-            app.state.subscription_task = subscription_task
-
-        # Signal that startup is complete if an event was provided
-        if startup_event is not None:
-            startup_event.set()
-        yield
-        # Shutdown: Cancel pending subscription task
-        subscription_task = getattr(app.state, "subscription_task", None)
-        if subscription_task is not None and not subscription_task.done():
-            subscription_task.cancel()
-            try:
-                await subscription_task
-            except asyncio.CancelledError:
-                pass
-        # Unsubscribe from WebSub hub if verified
-        if websub_subscriber and websub_subscriber.is_verified:
-            await websub_subscriber.unsubscribe()
+        async with AsyncExitStack() as stack:
+            # Startup: Subscribe to WebSub hub
+            if websub_subscriber:
+                # Hub requests made while the app runs share one client
+                await stack.enter_async_context(websub_subscriber)
+                # Run subscription in background
+                subscription_task = asyncio.create_task(
+                    subscribe_with_retry(websub_subscriber)
+                )
+                subscription_task.add_done_callback(log_task_exception)
+                app.state.subscription_task = subscription_task
+
+            # Signal that startup is complete if an event was provided
+            if startup_event is not None:
+                startup_event.set()
+            yield
+            # Shutdown: Cancel pending subscription task
+            subscription_task = getattr(app.state, "subscription_task", None)
+            if subscription_task is not None and not subscription_task.done():
+                subscription_task.cancel()
+                try:
+                    await subscription_task
+                except asyncio.CancelledError:
+                    pass
+            # Unsubscribe from WebSub hub if verified
+            if websub_subscriber and websub_subscriber.is_verified:
+                await websub_subscriber.unsubscribe()
 
         # Disconnect MCP servers on shutdown
         await agent.disconnect()
 
+    # Webhook-only apps skip the OpenAPI schema and docs pages unless
+    # --enable-docs asks for them
+    serve_docs = enable_docs or webchat_interface is not None
+
     # Create main app
     app = FastAPI(
         title=agent.name,
         description=agent.description or f"AFM Agent: {agent.name}",
         version=agent.afm.metadata.version or "0.0.0",
         lifespan=lifespan,
+        docs_url="/docs" if serve_docs else None,
+        redoc_url="/redoc" if serve_docs else None,
+        openapi_url="/openapi.json" if serve_docs else None,
     )
 
     # Store agent reference
     app.state.agent = agent
 
-    # Determine paths for info endpoint
-    webchat_path = get_http_path(webchat_interface) if webchat_interface else None
-    webhook_path = get_http_path(webhook_interface) if webhook_interface else None
-
     @app.get("/")
     async def root_info() -> dict[str, Any]:
         """Get agent metadata."""
@@ -255,33 +274,20 @@ def extract_interfaces(
 ) -> tuple[
     ConsoleChatInterface | None, WebChatInterface | None, WebhookInterface | None
 ]:
-    interfaces = get_interfaces(afm)
-
-    consolechat: ConsoleChatInterface | None = None
-    webchat: WebChatInterface | None = None
-    webhook: WebhookInterface | None = None
-
-    console_count = 0
-    webchat_count = 0
-    webhook_count = 0
-
-    for iface in interfaces:
-        if isinstance(iface, ConsoleChatInterface):
-            console_count += 1
-            consolechat = iface
-        elif isinstance(iface, WebChatInterface):
-            webchat_count += 1
-            webchat = iface
-        elif isinstance(iface, WebhookInterface):
-            webhook_count += 1
-            webhook = iface
-
-    if console_count > 1 or webchat_count > 1 or webhook_count > 1:
-        raise click.ClickException(
-            "Multiple interfaces of the same type are not supported"
-        )
+    # Interface is a tagged union, so the class alone identifies the slot
+    found: dict[type, Any] = {}
+    for iface in get_interfaces(afm):
+        if type(iface) in found:
+            raise click.ClickException(
+                "Multiple interfaces of the same type are not supported"
+            )
+        found[type(iface)] = iface
 
-    return consolechat, webchat, webhook
+    return (
+        found.get(ConsoleChatInterface),
+        found.get(WebChatInterface),
+        found.get(WebhookInterface),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -369,6 +375,11 @@ def validate(file: Path) -> None:
     is_flag=True,
     help="Skip consolechat interface even if defined",
 )
+@click.option(
+    "--enable-docs",
+    is_flag=True,
+    help="Serve the OpenAPI docs pages (/docs, /redoc) without a webchat interface",
+)
 @click.option(
     "--verbose",
     "-v",
@@ -388,6 +399,7 @@ def run(
     host: str,
     dry_run: bool,
     no_console: bool,
+    enable_docs: bool,
     verbose: bool,
     log_file: Path | None,
 ) -> None:
@@ -411,6 +423,17 @@ def run(
     has_http = webchat is not None or webhook is not None
     has_console = (consolechat is not None or not has_http) and not no_console
 
+    click.echo(f"Loading: {file}")
+
+    # Dry-run mode: validate and exit
+    if dry_run:
+        click.echo(format_validation_output(afm))
+        return
+
+    if not has_http and not has_console:
+        click.echo("No interfaces to run (consolechat skipped with --no-console)")
+        return
+
     # Configure logging
     log_level = logging.DEBUG if verbose else logging.INFO
     log_handlers: list[logging.Handler] = []
@@ -438,19 +461,8 @@ def run(
     )
 
     if not verbose:
-        logging.getLogger("httpx").setLevel(logging.WARNING)
-        logging.getLogger("httpcore").setLevel(logging.WARNING)
-
-    click.echo(f"Loading: {file}")
-
-    # Dry-run mode: validate and exit
-    if dry_run:
-        click.echo(format_validation_output(afm))
-        return
-
-    if not has_http and not has_console:
-        click.echo("No interfaces to run (consolechat skipped with --no-console)")
-        return
+        for http_logger in _HTTP_CLIENT_LOGGERS:
+            http_logger.setLevel(logging.WARNING)
 
     # Load runner backend via entry points
     try:
@@ -483,17 +495,34 @@ def run(
     # Run the appropriate configuration
     if has_http and has_console:
         # Both HTTP and console: run HTTP in background, console in foreground
-        asyncio.run(
+        _run_async(
             _run_http_and_console(
-                agent, webchat, webhook, host, port, verbose, has_console, log_file
+                agent,
+                webchat,
+                webhook,
+                host,
+                port,
+                verbose,
+                has_console,
+                log_file,
+                enable_docs=enable_docs,
             )
         )
     elif has_http:
         # HTTP only: run uvicorn blocking
-        _run_http_only(agent, webchat, webhook, host, port, verbose, log_file)
+        _run_http_only(
+            agent,
+            webchat,
+            webhook,
+            host,
+            port,
+            verbose,
+            log_file,
+            enable_docs=enable_docs,
+        )
     else:
         # Console only: run console blocking
-        asyncio.run(_run_console_only(agent))
+        _run_async(_run_console_only(agent))
 
 
 @cli.group()
@@ -531,6 +560,15 @@ def framework_list() -> None:
 # ---------------------------------------------------------------------------
 
 
+def _run_async(coro: Coroutine[Any, Any, None]) -> None:
+    with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+        runner.run(coro)
+
+
+class _ServerStoppedError(Exception):
+    """The HTTP server exited while the console chat was still running."""
+
+
 async def _run_http_and_console(
     agent: AgentRunner,
     webchat: WebChatInterface | None,
@@ -540,6 +578,8 @@ async def _run_http_and_console(
     verbose: bool,
     has_console: bool = False,
     log_file: Path | None = None,
+    *,
+    enable_docs: bool = False,
 ) -> None:
     # Event to signal when server startup is complete and agent is connected
     startup_event = asyncio.Event()
@@ -552,6 +592,7 @@ async def _run_http_and_console(
         startup_event=startup_event,
         host=host,
         port=port,
+        enable_docs=enable_docs,
     )
 
     # Configure uvicorn logging level
@@ -570,57 +611,46 @@ async def _run_http_and_console(
     )
     server = uvicorn.Server(config)
 
-    # Start HTTP server in background task
-    server_task = asyncio.create_task(server.serve())
-
-    try:
-        # Wait for EITHER server startup to complete OR server to fail.
-        startup_waiter = asyncio.create_task(startup_event.wait())
-        done, _pending = await asyncio.wait(
-            [server_task, startup_waiter],
-            return_when=asyncio.FIRST_COMPLETED,
-        )
-
-        if server_task in done:
-            # Server exited before startup completed — propagate the error
-            startup_waiter.cancel()
-            server_task.result()  # raises the underlying exception
-            return  # unreachable if result() raised
-
-        # Server started successfully — run console chat, but also watch
-        # for the server dying mid-run so we don't hang.
-        console_task = asyncio.create_task(async_run_console_chat(agent))
-        done, pending = await asyncio.wait(
-            [server_task, console_task],
-            return_when=asyncio.FIRST_COMPLETED,
-        )
+    server_stopped = asyncio.Event()
+    console_done = False
 
-        for task in pending:
-            task.cancel()
-            try:
-                await task
-            except (asyncio.CancelledError, SystemExit):
-                pass
+    async def serve() -> None:
+        try:
+            await server.serve()
+        finally:
+            server_stopped.set()
+        if not console_done:
+            # The server exited on its own (e.g. port in use); end the console too
+            raise _ServerStoppedError
+
+    async def chat() -> None:
+        nonlocal console_done
+        try:
+            await async_run_console_chat(agent)
+        finally:
+            # Stop the server gracefully so its lifespan disconnects the agent
+            console_done = True
+            server.should_exit = True
+            await server_stopped.wait()
 
-        # If the server exited (e.g. port in use), inform the user
-        if server_task in done:
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(serve())
+            # If the server fails before startup completes, the task group
+            # cancels this wait and re-raises the failure
+            await startup_event.wait()
+            tg.create_task(chat())
+    except* _ServerStoppedError:
+        if startup_event.is_set():
             click.echo(
                 "\nHTTP server stopped unexpectedly. Exiting.",
                 err=True,
             )
-
-        # Propagate any real exception from whichever task finished first
-        for task in done:
-            exc = task.exception()
-            if exc is not None and not isinstance(exc, SystemExit):
-                raise exc
-    finally:
-        # Ensure the HTTP server shuts down cleanly
-        server.should_exit = True
-        try:
-            await server_task
-        except (asyncio.CancelledError, SystemExit):
-            pass
+    except* Exception as eg:
+        # Report a single failure as itself rather than as a task group
+        if len(eg.exceptions) == 1:
+            raise eg.exceptions[0] from None
+        raise
 
 
 def _run_http_only(
@@ -631,6 +661,8 @@ def _run_http_only(
     port: int,
     verbose: bool,
     log_file: Path | None = None,
+    *,
+    enable_docs: bool = False,
 ) -> None:
     # Create unified app (lifespan handles MCP connections)
     app = create_unified_app(
@@ -639,6 +671,7 @@ def _run_http_only(
         webhook_interface=webhook,
         host=host,
         port=port,
+        enable_docs=enable_docs,
     )
 
     # Run uvicorn (blocking)
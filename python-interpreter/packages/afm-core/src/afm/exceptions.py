@@ -19,21 +19,34 @@ class AFMError(Exception):
     pass
 
 
+# Exceptions with a location or source prefix keep the undecorated message
+# in ``args`` and build the decorated form in ``__str__``, so exceptions that
+# are caught and discarded never pay for the formatting.
+
+
 class AFMParseError(AFMError):
     def __init__(self, message: str, line: int | None = None):
         self.line = line
-        if line is not None:
-            message = f"Line {line}: {message}"
         super().__init__(message)
 
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self.line is not None:
+            return f"Line {self.line}: {message}"
+        return message
+
 
 class AFMValidationError(AFMError):
     def __init__(self, message: str, field: str | None = None):
         self.field = field
-        if field is not None:
-            message = f"Field '{field}': {message}"
         super().__init__(message)
 
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self.field is not None:
+            return f"Field '{self.field}': {message}"
+        return message
+
 
 class VariableResolutionError(AFMError):
     def __init__(self, variable: str, reason: str):
@@ -41,6 +54,10 @@ class VariableResolutionError(AFMError):
         self.reason = reason
         super().__init__(f"Cannot resolve variable '${{{variable}}}': {reason}")
 
+    def __reduce__(self) -> tuple[type, tuple[str, str]]:
+        # args holds the formatted message, not the constructor arguments
+        return type(self), (self.variable, self.reason)
+
 
 class TemplateError(AFMError):
     def __init__(self, message: str, template: str | None = None):
@@ -69,10 +86,14 @@ class AgentError(AFMError):
 class ProviderError(AgentError):
     def __init__(self, message: str, provider: str | None = None):
         self.provider = provider
-        if provider is not None:
-            message = f"Provider '{provider}': {message}"
         super().__init__(message)
 
+    def __str__(self) -> str:
+        message = super().__str__()
+        if self.provider is not None:
+            return f"Provider '{self.provider}': {message}"
+        return message
+
 
 class InputValidationError(AFMValidationError):
     def __init__(self, message: str, schema_path: str | None = None):
@@ -99,10 +120,17 @@ class InterfaceNotFoundError(AFMError):
 class MCPError(AFMError):
     def __init__(self, message: str, server_name: str | None = None):
         self.server_name = server_name
-        if server_name is not None:
-            message = f"MCP server '{server_name}': {message}"
         super().__init__(message)
 
+    def __str__(self) -> str:
+        message = self._format_message()
+        if self.server_name is not None:
+            return f"MCP server '{self.server_name}': {message}"
+        return message
+
+    def _format_message(self) -> str:
+        return super().__str__()
+
 
 class MCPConnectionError(MCPError):
     pass
@@ -113,10 +141,14 @@ class MCPToolError(MCPError):
         self, message: str, server_name: str | None = None, tool_name: str | None = None
     ):
         self.tool_name = tool_name
-        if tool_name is not None:
-            message = f"Tool '{tool_name}': {message}"
         super().__init__(message, server_name)
 
+    def _format_message(self) -> str:
+        message = super()._format_message()
+        if self.tool_name is not None:
+            return f"Tool '{self.tool_name}': {message}"
+        return message
+
 
 class MCPAuthenticationError(MCPError):
     pass
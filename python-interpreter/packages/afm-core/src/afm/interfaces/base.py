@@ -16,6 +16,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
+
 from ..exceptions import InterfaceNotFoundError
 from ..models import (
     AFMRecord,
@@ -26,25 +28,37 @@ from ..models import (
     WebhookInterface,
 )
 
+# Default to consolechat if no interfaces specified
+_DEFAULT_INTERFACES: tuple[Interface, ...] = (ConsoleChatInterface(),)
+_DEFAULT_INTERFACES_BY_TYPE: Mapping[str, Interface] = {
+    interface.type: interface for interface in _DEFAULT_INTERFACES
+}
+
+
+def get_interfaces(afm: AFMRecord) -> Sequence[Interface]:
+    # Returned without copying; callers must not mutate the result
+    if afm.metadata.interfaces:
+        return afm.metadata.interfaces
+    return _DEFAULT_INTERFACES
+
 
-def get_interfaces(afm: AFMRecord) -> list[Interface]:
+def _get_interfaces_by_type(afm: AFMRecord) -> Mapping[str, Interface]:
     if afm.metadata.interfaces:
-        return list(afm.metadata.interfaces)
-    # Default to consolechat if no interfaces specified
-    return [ConsoleChatInterface()]
+        return afm.interfaces_by_type()
+    return _DEFAULT_INTERFACES_BY_TYPE
 
 
 def get_interface_by_type(
     afm: AFMRecord,
     interface_type: InterfaceType,
 ) -> Interface:
-    interfaces = get_interfaces(afm)
+    interfaces_by_type = _get_interfaces_by_type(afm)
 
-    for interface in interfaces:
-        if interface.type == interface_type.value:
-            return interface
+    interface = interfaces_by_type.get(interface_type.value)
+    if interface is not None:
+        return interface
 
-    available = [iface.type for iface in interfaces]
+    available = list(interfaces_by_type)
     raise InterfaceNotFoundError(interface_type.value, available)
 
 
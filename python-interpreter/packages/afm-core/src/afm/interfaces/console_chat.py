@@ -16,6 +16,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import uuid
 from typing import TYPE_CHECKING
@@ -31,6 +32,20 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_WELCOME_TEMPLATE = (
+    "Welcome to chat with {name}!\n"
+    "type 'exit', 'quit' or Ctrl+Q to end.\n"
+    "type 'help' or Ctrl+H for help.\n"
+    "type 'clear' or Ctrl+L to clear history."
+)
+
+_HELP_MESSAGE = (
+    "Available commands:\n"
+    "  exit, quit, Ctrl+Q  - End the chat session\n"
+    "  help,     Ctrl+H    - Show this help message\n"
+    "  clear,    Ctrl+L    - Clear conversation history"
+)
+
 
 class ChatApp(App):
     CSS_PATH = "console_chat.tcss"
@@ -64,12 +79,7 @@ class ChatApp(App):
             self.sub_title = self.agent.description
 
         # Show welcome message
-        welcome_msg = (
-            f"Welcome to chat with {self.agent.name}!\n"
-            "type 'exit', 'quit' or Ctrl+Q to end.\n"
-            "type 'help' or Ctrl+H for help.\n"
-            "type 'clear' or Ctrl+L to clear history."
-        )
+        welcome_msg = _WELCOME_TEMPLATE.format(name=self.agent.name)
         self.query_one("#chat-log").mount(Static(welcome_msg, classes="system-message"))
         self.query_one("#chat-input").focus()
 
@@ -104,10 +114,12 @@ class ChatApp(App):
 
             # Display user message
             chat_log = self.query_one("#chat-log")
-            msg_widget = Static(f"{escape(user_input)}", classes="message user-message")
+            # The container right-aligns the bubble; agent bubbles sit on the
+            # left by default and are mounted without one
             await chat_log.mount(
                 Vertical(
-                    msg_widget, classes="message-container message-container--user"
+                    Static(escape(user_input), classes="message user-message"),
+                    classes="message-container message-container--user",
                 )
             )
 
@@ -132,19 +144,14 @@ class ChatApp(App):
 
             # Handle non-string responses
             if not isinstance(response, str):
-                import json
-
                 response = json.dumps(response, indent=2)
 
             # Remove thinking and show response
             await thinking.remove()
             logger.debug(f"Mounting response: '{response}'")
 
-            msg_widget = Static(f"{escape(response)}", classes="message agent-message")
             await chat_log.mount(
-                Vertical(
-                    msg_widget, classes="message-container message-container--agent"
-                )
+                Static(escape(response), classes="message agent-message")
             )
             chat_log.scroll_end(animate=True)
 
@@ -169,13 +176,9 @@ class ChatApp(App):
                 logger.exception(f"Could not report error to UI: {e2}")
 
     def action_show_help(self) -> None:
-        help_msg = (
-            "Available commands:\n"
-            "  exit, quit, Ctrl+Q  - End the chat session\n"
-            "  help,     Ctrl+H    - Show this help message\n"
-            "  clear,    Ctrl+L    - Clear conversation history"
+        self.query_one("#chat-log").mount(
+            Static(_HELP_MESSAGE, classes="system-message")
         )
-        self.query_one("#chat-log").mount(Static(help_msg, classes="system-message"))
         self.query_one("#chat-log").scroll_end()
 
     def action_clear_history(self) -> None:
@@ -0,0 +1,49 @@
+# Copyright (c) 2025, WSO2 LLC. (https://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    Falls back to the stdlib encoder for values orjson rejects, such as
+    integers wider than 64 bits.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content)
+        except orjson.JSONEncodeError:
+            return super().render(content)
+
+
+def json_text(content: Any) -> str:
+    """Serialize ``content`` to compact JSON text.
+
+    Uses orjson, falling back to the stdlib encoder for values orjson
+    rejects, such as non-string dict keys or integers wider than 64 bits.
+    """
+    try:
+        return orjson.dumps(content).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(content, separators=(",", ":"), ensure_ascii=False)
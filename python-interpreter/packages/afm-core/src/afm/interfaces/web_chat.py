@@ -16,17 +16,21 @@
 
 from __future__ import annotations
 
+import functools
 import html
 import json
 import logging
+import re
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import orjson
 from fastapi import APIRouter, FastAPI, Header, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 
 from .base import InterfaceNotFoundError, get_http_path, get_webchat_interface
+from .responses import OrjsonResponse, json_text
 
 logger = logging.getLogger(__name__)
 
@@ -34,24 +38,57 @@ CHAT_UI_TEMPLATE_PATH = (
     Path(__file__).resolve().parent.parent / "resources" / "chat-ui.html"
 )
 
-_chat_ui_template_cache: str | None = None
+_PLACEHOLDER_PATTERN = re.compile(
+    r"\{\{(AGENT_NAME|AGENT_DESCRIPTION|AGENT_ICON_URL|AGENT_ICON_STYLE|CHAT_PATH)\}\}"
+)
 
 
+@functools.cache
 def get_chat_ui_template() -> str:
-    global _chat_ui_template_cache
-    if _chat_ui_template_cache is not None:
-        return _chat_ui_template_cache
     try:
-        _chat_ui_template_cache = CHAT_UI_TEMPLATE_PATH.read_text(encoding="utf-8")
+        return CHAT_UI_TEMPLATE_PATH.read_text(encoding="utf-8")
     except FileNotFoundError as e:
         raise FileNotFoundError(
             f"Chat UI template not found at {CHAT_UI_TEMPLATE_PATH}. "
             "Ensure the resources/chat-ui.html file exists in the package."
         ) from e
-    return _chat_ui_template_cache
+
+
+@functools.lru_cache(maxsize=32)
+def _escape_agent_fields(
+    name: str,
+    description: str | None,
+    icon_url: str | None,
+) -> tuple[str, str, str, str]:
+    escaped_icon_url = "" if icon_url is None else html.escape(icon_url)
+    icon_style = "" if escaped_icon_url else "display:none;"
+    escaped_description = "" if description is None else html.escape(description)
+    return html.escape(name), escaped_description, escaped_icon_url, icon_style
+
+
+@functools.lru_cache(maxsize=32)
+def _render_ui_html(
+    agent_name: str,
+    agent_description: str,
+    icon_url: str,
+    icon_style: str,
+    chat_path: str,
+) -> str:
+    mapping = {
+        "AGENT_NAME": agent_name,
+        "AGENT_DESCRIPTION": agent_description,
+        "AGENT_ICON_URL": icon_url,
+        "AGENT_ICON_STYLE": icon_style,
+        "CHAT_PATH": json.dumps(chat_path),
+    }
+    return _PLACEHOLDER_PATTERN.sub(
+        lambda m: mapping[m.group(1)], get_chat_ui_template()
+    )
 
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from ..runner import AgentRunner
     from ..models import Signature
 
@@ -76,6 +113,144 @@ class ErrorResponse(BaseModel):
     detail: str | None = Field(None, description="Detailed error information")
 
 
+def _parse_string_input(body: Any) -> str:
+    if not isinstance(body, str):
+        raise HTTPException(
+            status_code=400,
+            detail="Expected JSON string for string input",
+        )
+    return body
+
+
+def _parse_object_input(body: Any) -> Any:
+    return body
+
+
+def _get_media_type(request: Request) -> str:
+    content_type = request.headers.get("content-type", "")
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+def _read_text_message(body: bytes) -> str:
+    return body.decode("utf-8")
+
+
+def _read_json_message(body: bytes) -> str:
+    return _parse_string_input(orjson.loads(body))
+
+
+def _reject_string_message(body: bytes) -> str:
+    raise HTTPException(
+        status_code=400,
+        detail="Unsupported Content-Type for string input",
+    )
+
+
+# Message readers for the string-input endpoint, keyed by media type
+_STRING_MESSAGE_READERS = {
+    "": _read_text_message,
+    "text/plain": _read_text_message,
+    "application/json": _read_json_message,
+}
+
+
+def _format_string_output(response: Any) -> OrjsonResponse:
+    if not isinstance(response, str):
+        response = json_text(response)
+    return OrjsonResponse(content={"response": response})
+
+
+def _format_object_output(response: Any) -> OrjsonResponse:
+    # Object output - return as-is or wrap
+    if isinstance(response, dict):
+        return OrjsonResponse(content=response)
+    elif isinstance(response, str):
+        # Try to parse as JSON
+        try:
+            return OrjsonResponse(content=orjson.loads(response))
+        except orjson.JSONDecodeError:
+            return OrjsonResponse(content={"response": response})
+    else:
+        return OrjsonResponse(content={"response": response})
+
+
+async def _chat_string(
+    agent: AgentRunner, body: bytes, media_type: str, session_id: str
+) -> str:
+    try:
+        read_message = _STRING_MESSAGE_READERS.get(media_type, _reject_string_message)
+        message = read_message(body)
+
+        if not isinstance(message, str) or not message.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="Message body must be a non-empty string",
+            )
+
+        response = await agent.arun(message, session_id=session_id)
+
+        if not isinstance(response, str):
+            response = json_text(response)
+
+        return response
+
+    except HTTPException:
+        raise
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid JSON in request body",
+        ) from e
+    except UnicodeDecodeError as e:
+        raise HTTPException(
+            status_code=400,
+            detail="Request body must be valid UTF-8",
+        ) from e
+    except Exception as e:
+        logger.exception(f"Error in chat_string for session {session_id}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error",
+        ) from e
+
+
+async def _chat_object(
+    agent: AgentRunner,
+    body: bytes,
+    media_type: str,
+    session_id: str,
+    parse_input: Callable[[Any], Any],
+    format_output: Callable[[Any], OrjsonResponse],
+) -> OrjsonResponse:
+    try:
+        if media_type != "application/json":
+            raise HTTPException(
+                status_code=400,
+                detail="Content-Type must be application/json",
+            )
+        input_data = parse_input(orjson.loads(body))
+
+        # Run the agent
+        response = await agent.arun(input_data, session_id=session_id)
+
+        # Format response based on output schema
+        return format_output(response)
+
+    except HTTPException:
+        raise
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid JSON in request body",
+        ) from e
+    except Exception as e:
+        logger.exception(f"Error in chat_object for session {session_id}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error",
+        ) from e
+
+
 def create_webchat_router(
     agent: AgentRunner,
     signature: Signature,
@@ -84,21 +259,15 @@ def create_webchat_router(
     router = APIRouter()
     ui_path = "/chat/ui"
     raw_icon_url = agent.afm.metadata.icon_url
-    icon_url = "" if raw_icon_url is None else html.escape(str(raw_icon_url))
-    icon_style = "" if icon_url else "display:none;"
-    agent_name = html.escape(str(agent.name))
-    agent_description = (
-        "" if agent.description is None else html.escape(str(agent.description))
-    )
-    chat_path_json = json.dumps(path)
-    ui_html = (
-        get_chat_ui_template()
-        .replace("{{AGENT_NAME}}", agent_name)
-        .replace("{{AGENT_DESCRIPTION}}", agent_description)
-        .replace("{{AGENT_ICON_URL}}", icon_url)
-        .replace("{{AGENT_ICON_STYLE}}", icon_style)
-        .replace("{{CHAT_PATH}}", chat_path_json)
+    agent_name, agent_description, icon_url, icon_style = _escape_agent_fields(
+        str(agent.name),
+        None if agent.description is None else str(agent.description),
+        None if raw_icon_url is None else str(raw_icon_url),
     )
+    # Encoded once here; Starlette passes bytes content through untouched
+    ui_html = _render_ui_html(
+        agent_name, agent_description, icon_url, icon_style, path
+    ).encode("utf-8")
 
     @router.get(ui_path, response_class=HTMLResponse)
     async def chat_ui() -> HTMLResponse:
@@ -125,61 +294,22 @@ def create_webchat_router(
             x_session_id: str | None = Header(None, alias="X-Session-Id"),
         ) -> PlainTextResponse:
             """Chat with the agent using simple string messages."""
-            session_id = x_session_id or "default"
-
-            try:
-                content_type = request.headers.get("content-type", "").lower()
-                if content_type.startswith("text/plain") or not content_type:
-                    body = await request.body()
-                    message = body.decode("utf-8")
-                elif content_type.startswith("application/json"):
-                    body = await request.json()
-                    if not isinstance(body, str):
-                        raise HTTPException(
-                            status_code=400,
-                            detail="Expected JSON string for string input",
-                        )
-                    message = body
-                else:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Unsupported Content-Type for string input",
-                    )
-
-                if not isinstance(message, str) or not message.strip():
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Message body must be a non-empty string",
-                    )
-
-                response = await agent.arun(message, session_id=session_id)
-
-                if not isinstance(response, str):
-                    response = json.dumps(response)
-
-                return PlainTextResponse(content=response)
-
-            except HTTPException:
-                raise
-            except json.JSONDecodeError as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid JSON in request body",
-                ) from e
-            except UnicodeDecodeError as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Request body must be valid UTF-8",
-                ) from e
-            except Exception as e:
-                logger.exception(f"Error in chat_string for session {session_id}: {e}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Internal server error",
-                ) from e
+            response = await _chat_string(
+                agent,
+                await request.body(),
+                _get_media_type(request),
+                x_session_id or "default",
+            )
+            return PlainTextResponse(content=response)
 
     else:
-        # Complex schema-based chat
+        # Complex schema-based chat: select input parsing and output
+        # formatting once here rather than branching on every request
+        parse_input = _parse_string_input if input_is_string else _parse_object_input
+        format_output = (
+            _format_string_output if output_is_string else _format_object_output
+        )
+
         @router.post(
             path,
             responses={
@@ -190,66 +320,16 @@ def create_webchat_router(
         async def chat_object(
             request: Request,
             x_session_id: str | None = Header(None, alias="X-Session-Id"),
-        ) -> JSONResponse:
+        ) -> OrjsonResponse:
             """Chat with the agent using schema-validated messages."""
-            session_id = x_session_id or "default"
-
-            try:
-                content_type = request.headers.get("content-type", "").lower()
-                if not content_type.startswith("application/json"):
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Content-Type must be application/json",
-                    )
-                # Parse request body
-                body = await request.json()
-
-                # For string input schema, extract the string value
-                if input_is_string:
-                    if isinstance(body, str):
-                        input_data: str | dict[str, Any] = body
-                    else:
-                        raise HTTPException(
-                            status_code=400,
-                            detail="Expected JSON string for string input",
-                        )
-                else:
-                    input_data = body
-
-                # Run the agent
-                response = await agent.arun(input_data, session_id=session_id)
-
-                # Format response based on output schema
-                if output_is_string:
-                    if not isinstance(response, str):
-                        response = json.dumps(response)
-                    return JSONResponse(content={"response": response})
-                else:
-                    # Object output - return as-is or wrap
-                    if isinstance(response, dict):
-                        return JSONResponse(content=response)
-                    elif isinstance(response, str):
-                        # Try to parse as JSON
-                        try:
-                            return JSONResponse(content=json.loads(response))
-                        except json.JSONDecodeError:
-                            return JSONResponse(content={"response": response})
-                    else:
-                        return JSONResponse(content={"response": response})
-
-            except HTTPException:
-                raise
-            except json.JSONDecodeError as e:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid JSON in request body",
-                ) from e
-            except Exception as e:
-                logger.exception(f"Error in chat_object for session {session_id}: {e}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Internal server error",
-                ) from e
+            return await _chat_object(
+                agent,
+                await request.body(),
+                _get_media_type(request),
+                x_session_id or "default",
+                parse_input,
+                format_output,
+            )
 
     return router
 
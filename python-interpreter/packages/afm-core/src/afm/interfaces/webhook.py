@@ -17,29 +17,41 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
 import hmac
-import json
 import logging
-from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING, Any, AsyncGenerator
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Self
+from urllib.parse import urlencode
 
 import httpx
+import orjson
 from fastapi import APIRouter, FastAPI, HTTPException, Query, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import PlainTextResponse, Response
 from pydantic import BaseModel, Field
 
 from ..constants import DEFAULT_HTTP_PORT
 from ..exceptions import TemplateEvaluationError
 from ..templates import compile_template, evaluate_template
 from .base import InterfaceNotFoundError, get_http_path, get_webhook_interface
+from .responses import OrjsonResponse, json_text
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from ..runner import AgentRunner
     from ..models import CompiledTemplate, WebhookInterface
 
 logger = logging.getLogger(__name__)
 
+# A subscriber only ever talks to its own hub
+_HUB_POOL_LIMITS = httpx.Limits(max_connections=2, max_keepalive_connections=1)
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Marks an app whose state never had a subscriber assigned
+_NO_SUBSCRIBER: Any = object()
+
 
 class WebhookResponse(BaseModel):
     result: Any = Field(..., description="The agent's response to the webhook")
@@ -71,44 +83,77 @@ class WebSubSubscriber:
         self.lease_seconds = lease_seconds
         self._verified = False
         self._challenge: str | None = None
+        self._client: httpx.AsyncClient | None = None
 
     @property
     def is_verified(self) -> bool:
         return self._verified
 
+    @functools.cached_property
+    def _subscribe_form(self) -> bytes:
+        # Encoded once; retries resend the same body
+        data = {
+            "hub.mode": "subscribe",
+            "hub.topic": self.topic,
+            "hub.callback": self.callback,
+            "hub.lease_seconds": str(self.lease_seconds),
+        }
+
+        if self.secret:
+            data["hub.secret"] = self.secret
+
+        return urlencode(data).encode("ascii")
+
+    @functools.cached_property
+    def _unsubscribe_form(self) -> bytes:
+        data = {
+            "hub.mode": "unsubscribe",
+            "hub.topic": self.topic,
+            "hub.callback": self.callback,
+        }
+        return urlencode(data).encode("ascii")
+
+    async def __aenter__(self) -> Self:
+        # Requests made inside the context share one client, so retries and
+        # the final unsubscribe reuse the connection to the hub
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30.0, limits=_HUB_POOL_LIMITS)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post(self, form: bytes) -> httpx.Response:
+        if self._client is not None:
+            return await self._client.post(
+                self.hub, content=form, headers=_FORM_HEADERS
+            )
+        # Outside ``async with``, use a client that lives for this request only
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await client.post(self.hub, content=form, headers=_FORM_HEADERS)
+
     async def subscribe(self) -> bool:
         try:
-            async with httpx.AsyncClient() as client:
-                data = {
-                    "hub.mode": "subscribe",
-                    "hub.topic": self.topic,
-                    "hub.callback": self.callback,
-                    "hub.lease_seconds": str(self.lease_seconds),
-                }
-
-                if self.secret:
-                    data["hub.secret"] = self.secret
-
-                response = await client.post(
-                    self.hub,
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    timeout=30.0,
-                )
+            response = await self._post(self._subscribe_form)
 
-                # WebSub spec: 202 Accepted means subscription request received
-                if response.status_code in (200, 202, 204):
-                    logger.info(
-                        f"WebSub subscription request sent to {self.hub} "
-                        f"for topic {self.topic}"
-                    )
-                    return True
-                else:
-                    logger.error(
-                        f"WebSub subscription failed: {response.status_code} "
-                        f"{response.text}"
-                    )
-                    return False
+            # WebSub spec: 202 Accepted means subscription request received
+            if response.status_code in (200, 202, 204):
+                logger.info(
+                    f"WebSub subscription request sent to {self.hub} "
+                    f"for topic {self.topic}"
+                )
+                return True
+            else:
+                logger.error(
+                    f"WebSub subscription failed: {response.status_code} "
+                    f"{response.text}"
+                )
+                return False
 
         except Exception as e:
             logger.error(f"WebSub subscription error: {e}")
@@ -116,28 +161,16 @@ class WebSubSubscriber:
 
     async def unsubscribe(self) -> bool:
         try:
-            async with httpx.AsyncClient() as client:
-                data = {
-                    "hub.mode": "unsubscribe",
-                    "hub.topic": self.topic,
-                    "hub.callback": self.callback,
-                }
-
-                response = await client.post(
-                    self.hub,
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    timeout=30.0,
-                )
+            response = await self._post(self._unsubscribe_form)
 
-                if response.status_code in (200, 202, 204):
-                    logger.info(f"WebSub unsubscription request sent for {self.topic}")
-                    return True
-                else:
-                    logger.warning(
-                        f"WebSub unsubscription may have failed: {response.status_code}"
-                    )
-                    return False
+            if response.status_code in (200, 202, 204):
+                logger.info(f"WebSub unsubscription request sent for {self.topic}")
+                return True
+            else:
+                logger.warning(
+                    f"WebSub unsubscription may have failed: {response.status_code}"
+                )
+                return False
 
         except Exception as e:
             logger.error(f"WebSub unsubscription error: {e}")
@@ -174,8 +207,25 @@ def verify_webhook_signature(
     *,
     algorithm: str = "sha256",
 ) -> bool:
-    if not signature_header:
+    parsed = _parse_signature(signature_header, secret, algorithm)
+    if parsed is None:
         return False
+    template, provided_digest = parsed
+
+    mac = template.copy()
+    mac.update(body)
+
+    # Constant-time comparison
+    return hmac.compare_digest(mac.digest(), provided_digest)
+
+
+def _parse_signature(
+    signature_header: str | None, secret: str, algorithm: str = "sha256"
+) -> tuple[hmac.HMAC, bytes] | None:
+    # Returns the keyed HMAC template and the raw digest the sender claims,
+    # or None if the header can never match
+    if not signature_header:
+        return None
 
     # Parse signature header (format: "algorithm=signature")
     if "=" in signature_header:
@@ -186,22 +236,52 @@ def verify_webhook_signature(
     else:
         provided_sig = signature_header
 
-    # Compute expected signature
+    template = _hmac_template(secret, algorithm)
+
+    # Compare raw digests; malformed hex can never match, so reject it
+    # before hashing the body
+    if len(provided_sig) != template.digest_size * 2:
+        return None
+    try:
+        provided_digest = bytes.fromhex(provided_sig)
+    except ValueError:
+        return None
+    return template, provided_digest
+
+
+async def _read_signed_body(request: Request, secret: str) -> bytearray:
+    # Hashes the body as it arrives rather than after buffering all of it;
+    # a request whose signature can never match is rejected unread
+    parsed = _parse_signature(
+        request.headers.get("X-Hub-Signature-256")
+        or request.headers.get("X-Hub-Signature"),
+        secret,
+    )
+    if parsed is None:
+        raise HTTPException(status_code=401, detail="Invalid signature")
+    template, provided_digest = parsed
+
+    mac = template.copy()
+    body = bytearray()
+    async for chunk in request.stream():
+        mac.update(chunk)
+        body += chunk
+
+    if not hmac.compare_digest(mac.digest(), provided_digest):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+    return body
+
+
+@functools.lru_cache(maxsize=32)
+def _hmac_template(secret: str, algorithm: str) -> hmac.HMAC:
+    # Keyed once per secret; callers copy() it for each message
     if algorithm == "sha1":
         hash_func = hashlib.sha1
     elif algorithm == "sha512":
         hash_func = hashlib.sha512
     else:
         hash_func = hashlib.sha256
-
-    expected_sig = hmac.new(
-        secret.encode("utf-8"),
-        body,
-        hash_func,
-    ).hexdigest()
-
-    # Constant-time comparison
-    return hmac.compare_digest(expected_sig.lower(), provided_sig.lower())
+    return hmac.new(secret.encode("utf-8"), digestmod=hash_func)
 
 
 def create_webhook_router(
@@ -235,12 +315,19 @@ def create_webhook_router(
         hub_challenge: str = Query(..., alias="hub.challenge"),
         hub_lease_seconds: int | None = Query(None, alias="hub.lease_seconds"),
     ) -> PlainTextResponse:
-        # Check for subscriber in app state (for topic verification)
-        websub_subscriber = getattr(request.app.state, "websub_subscriber", None)
+        # Check for subscriber in app state (for topic verification); a
+        # single lookup tells "unset" apart from "explicitly None"
+        websub_subscriber = getattr(
+            request.app.state, "websub_subscriber", _NO_SUBSCRIBER
+        )
 
         if hub_mode in ("subscribe", "unsubscribe"):
+            if websub_subscriber is None:
+                # Subscriber was explicitly set to None - reject verification
+                raise HTTPException(status_code=404, detail="No subscriber configured")
+
             # If we have a subscriber, verify the topic matches
-            if websub_subscriber is not None:
+            if websub_subscriber is not _NO_SUBSCRIBER:
                 # Use subscriber's verification logic
                 challenge = websub_subscriber.verify_challenge(
                     hub_mode,
@@ -253,10 +340,6 @@ def create_webhook_router(
                 # Verification failed (e.g. topic mismatch)
                 raise HTTPException(status_code=404, detail="Verification failed")
 
-            elif hasattr(request.app.state, "websub_subscriber"):
-                # Subscriber was explicitly set to None - reject verification
-                raise HTTPException(status_code=404, detail="No subscriber configured")
-
             return PlainTextResponse(content=hub_challenge)
         raise HTTPException(status_code=404, detail="Invalid mode")
 
@@ -269,75 +352,84 @@ def create_webhook_router(
             500: {"model": ErrorResponse},
         },
     )
-    async def receive_webhook(request: Request) -> JSONResponse:
-        # Get raw body for signature verification
-        body = await request.body()
-
+    async def receive_webhook(request: Request) -> Response:
         # Verify signature if configured
         if verify_signatures and secret:
-            signature_header = request.headers.get(
-                "X-Hub-Signature-256"
-            ) or request.headers.get("X-Hub-Signature")
-
-            if not verify_webhook_signature(body, signature_header, secret):
-                raise HTTPException(
-                    status_code=401,
-                    detail="Invalid signature",
-                )
+            body: bytes | bytearray = await _read_signed_body(request, secret)
+        else:
+            body = await request.body()
+        return await _handle_webhook(
+            agent,
+            body,
+            request.headers,
+            compiled_prompt,
+            output_is_string,
+        )
+
+    return router
+
 
+async def _handle_webhook(
+    agent: AgentRunner,
+    body: bytes | bytearray,
+    headers: Mapping[str, str],
+    compiled_prompt: CompiledTemplate | None,
+    output_is_string: bool,
+) -> Response:
+    # The caller has already verified the signature, if configured
+    try:
+        # Parse payload
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid JSON payload",
+        ) from e
+
+    # Construct user prompt
+    if compiled_prompt:
         try:
-            # Parse payload
-            payload = json.loads(body)
-        except json.JSONDecodeError as e:
+            # Headers are only read if the template references them
+            user_prompt = evaluate_template(compiled_prompt, payload, headers)
+        except TemplateEvaluationError as e:
+            logger.warning(f"Template evaluation error: {e}")
             raise HTTPException(
                 status_code=400,
-                detail="Invalid JSON payload",
+                detail="Failed to evaluate prompt template",
             ) from e
+    else:
+        # Default: stringify the payload
+        user_prompt = orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode()
 
-        headers = dict(request.headers)
-        # Construct user prompt
-        if compiled_prompt:
-            try:
-                user_prompt = evaluate_template(compiled_prompt, payload, headers)
-            except TemplateEvaluationError as e:
-                logger.warning(f"Template evaluation error: {e}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to evaluate prompt template",
-                ) from e
+    try:
+        # Run the agent
+        response = await agent.arun(user_prompt)
+        logger.debug(f"Agent response: {response}")
+
+        # Format response based on output schema
+        if output_is_string:
+            if not isinstance(response, str):
+                response = json_text(response)
+            return OrjsonResponse(content={"result": response})
         else:
-            # Default: stringify the payload
-            user_prompt = json.dumps(payload, indent=2)
-
-        try:
-            # Run the agent
-            response = await agent.arun(user_prompt)
-            logger.debug(f"Agent response: {response}")
-
-            # Format response based on output schema
-            if output_is_string:
-                if not isinstance(response, str):
-                    response = json.dumps(response)
-                return JSONResponse(content={"result": response})
+            if isinstance(response, dict):
+                return OrjsonResponse(content=response)
+            elif isinstance(response, str):
+                try:
+                    orjson.loads(response)
+                except orjson.JSONDecodeError:
+                    return OrjsonResponse(content={"result": response})
+                # Already JSON; send it as-is rather than re-serializing
+                return Response(content=response, media_type="application/json")
             else:
-                if isinstance(response, dict):
-                    return JSONResponse(content=response)
-                elif isinstance(response, str):
-                    try:
-                        return JSONResponse(content=json.loads(response))
-                    except json.JSONDecodeError:
-                        return JSONResponse(content={"result": response})
-                else:
-                    return JSONResponse(content={"result": response})
+                return OrjsonResponse(content={"result": response})
 
-        except Exception as e:
-            logger.exception("Agent execution error")
-            raise HTTPException(
-                status_code=500,
-                detail="Internal server error",
-            ) from e
-
-    return router
+    except Exception as e:
+        logger.exception("Agent execution error")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error",
+        ) from e
 
 
 def create_webhook_app(
@@ -393,26 +485,29 @@ def create_webhook_app(
     # Create lifespan context manager for startup/shutdown
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-        # Startup: Subscribe to WebSub hub
-        if websub_subscriber:
-            # Run subscription in background to not block startup
-            subscription_task = asyncio.create_task(
-                subscribe_with_retry(websub_subscriber)
-            )
-            subscription_task.add_done_callback(log_task_exception)
-            app.state.subscription_task = subscription_task
-        yield
-        # Shutdown: Cancel pending subscription task
-        subscription_task = getattr(app.state, "subscription_task", None)
-        if subscription_task is not None and not subscription_task.done():
-            subscription_task.cancel()
-            try:
-                await subscription_task
-            except asyncio.CancelledError:
-                pass
-        # Unsubscribe from WebSub hub if verified
-        if websub_subscriber and websub_subscriber.is_verified:
-            await websub_subscriber.unsubscribe()
+        async with AsyncExitStack() as stack:
+            # Startup: Subscribe to WebSub hub
+            if websub_subscriber:
+                # Hub requests made while the app runs share one client
+                await stack.enter_async_context(websub_subscriber)
+                # Run subscription in background to not block startup
+                subscription_task = asyncio.create_task(
+                    subscribe_with_retry(websub_subscriber)
+                )
+                subscription_task.add_done_callback(log_task_exception)
+                app.state.subscription_task = subscription_task
+            yield
+            # Shutdown: Cancel pending subscription task
+            subscription_task = getattr(app.state, "subscription_task", None)
+            if subscription_task is not None and not subscription_task.done():
+                subscription_task.cancel()
+                try:
+                    await subscription_task
+                except asyncio.CancelledError:
+                    pass
+            # Unsubscribe from WebSub hub if verified
+            if websub_subscriber and websub_subscriber.is_verified:
+                await websub_subscriber.unsubscribe()
 
     # Create the FastAPI app
     app = FastAPI(
@@ -16,11 +16,20 @@
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Callable, Mapping
 from enum import Enum
 from pathlib import Path
-from typing import Annotated, Literal, Self
+from typing import Annotated, Any, Literal, Self
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    model_validator,
+)
 
 
 class Provider(BaseModel):
@@ -30,6 +39,29 @@ class Provider(BaseModel):
     url: str | None = None
 
 
+def _validate_bearer_fields(auth: ClientAuthentication) -> None:
+    if auth.token is None:
+        raise ValueError("type 'bearer' requires 'token' field")
+
+
+def _validate_basic_fields(auth: ClientAuthentication) -> None:
+    if auth.username is None or auth.password is None:
+        raise ValueError("type 'basic' requires 'username' and 'password' fields")
+
+
+def _validate_api_key_fields(auth: ClientAuthentication) -> None:
+    if auth.api_key is None:
+        raise ValueError("type 'api-key' requires 'api_key' field")
+
+
+# Required-field checks per (lowercased) authentication type
+_AUTH_FIELD_VALIDATORS: dict[str, Callable[[ClientAuthentication], None]] = {
+    "bearer": _validate_bearer_fields,
+    "basic": _validate_basic_fields,
+    "api-key": _validate_api_key_fields,
+}
+
+
 class ClientAuthentication(BaseModel):
     model_config = ConfigDict(extra="allow")
 
@@ -41,18 +73,9 @@ class ClientAuthentication(BaseModel):
 
     @model_validator(mode="after")
     def validate_type_fields(self) -> Self:
-        match self.type.lower():
-            case "bearer":
-                if self.token is None:
-                    raise ValueError("type 'bearer' requires 'token' field")
-            case "basic":
-                if self.username is None or self.password is None:
-                    raise ValueError(
-                        "type 'basic' requires 'username' and 'password' fields"
-                    )
-            case "api-key":
-                if self.api_key is None:
-                    raise ValueError("type 'api-key' requires 'api_key' field")
+        validator = _AUTH_FIELD_VALIDATORS.get(self.type.lower())
+        if validator is not None:
+            validator(self)
         return self
 
 
@@ -89,11 +112,29 @@ Transport = Annotated[
 
 
 class ToolFilter(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    # validate_assignment reruns build_sets when allow or deny is reassigned
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
 
     allow: list[str] | None = None
     deny: list[str] | None = None
 
+    _allow_set: frozenset[str] | None = PrivateAttr(default=None)
+    _deny_set: frozenset[str] = PrivateAttr(default=frozenset())
+
+    @model_validator(mode="after")
+    def build_sets(self) -> Self:
+        self._allow_set = frozenset(self.allow) if self.allow is not None else None
+        self._deny_set = frozenset(self.deny) if self.deny is not None else frozenset()
+        return self
+
+    @property
+    def allow_set(self) -> frozenset[str] | None:
+        return self._allow_set
+
+    @property
+    def deny_set(self) -> frozenset[str]:
+        return self._deny_set
+
 
 class MCPServer(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -110,7 +151,8 @@ class Tools(BaseModel):
 
 
 class JSONSchema(BaseModel):
-    model_config = ConfigDict(extra="allow")
+    # Frozen so the cached dict form below cannot go stale
+    model_config = ConfigDict(extra="allow", defer_build=True, frozen=True)
 
     type: str
     properties: dict[str, JSONSchema] | None = None
@@ -118,6 +160,9 @@ class JSONSchema(BaseModel):
     items: JSONSchema | None = None
     description: str | None = None
 
+    # Plain-dict form, built once by afm.schema_validator
+    _schema_dict: dict[str, Any] | None = PrivateAttr(default=None)
+
 
 class Signature(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -193,6 +238,13 @@ Interface = Annotated[
     Field(discriminator="type"),
 ]
 
+# Built once so standalone interface validation reuses the union validator
+_INTERFACE_ADAPTER: TypeAdapter[Interface] = TypeAdapter(Interface)
+
+
+def parse_interface(data: Any) -> Interface:
+    return _INTERFACE_ADAPTER.validate_python(data)
+
 
 class LocalSkillSource(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -244,35 +296,45 @@ class AFMRecord(BaseModel):
     instructions: str
     source_dir: Path | None = Field(default=None, exclude=True)
 
+    # Interface-type index and the interfaces it was built from
+    _interfaces_by_type: tuple[tuple[Interface, ...], dict[str, Interface]] | None = (
+        PrivateAttr(default=None)
+    )
 
-class LiteralSegment(BaseModel):
-    model_config = ConfigDict(frozen=True)
-
-    kind: Literal["literal"] = "literal"
-    text: str
-
-
-class PayloadVariable(BaseModel):
-    model_config = ConfigDict(frozen=True)
-
-    kind: Literal["payload"] = "payload"
-    path: str
-
-
-class HeaderVariable(BaseModel):
-    model_config = ConfigDict(frozen=True)
+    def interfaces_by_type(self) -> Mapping[str, Interface]:
+        # First interface of a given type wins, matching a linear scan. The
+        # index is reused only while it was built from the very same
+        # interface objects, so replacing or editing the list rebuilds it
+        interfaces = tuple(self.metadata.interfaces or ())
+        cached = self._interfaces_by_type
+        if (
+            cached is not None
+            and len(cached[0]) == len(interfaces)
+            and all(a is b for a, b in zip(cached[0], interfaces))
+        ):
+            return cached[1]
 
-    kind: Literal["header"] = "header"
-    name: str
+        index: dict[str, Interface] = {}
+        for interface in interfaces:
+            # Interned keys let lookups by InterfaceType values (which are
+            # interned literals) hit the identity fast path in the dict probe
+            index.setdefault(sys.intern(interface.type), interface)
+        self._interfaces_by_type = (interfaces, index)
+        return index
 
 
-# Type alias for template segments
-TemplateSegment = Annotated[
-    LiteralSegment | PayloadVariable | HeaderVariable, Field(discriminator="kind")
-]
+SegmentKind = Literal["literal", "payload", "header"]
 
 
 class CompiledTemplate(BaseModel):
     model_config = ConfigDict(frozen=True)
 
-    segments: tuple[TemplateSegment, ...]
+    # Parallel per-segment tuples. values holds the literal text, the payload
+    # accessor function or the lower-cased header name; sources holds the
+    # payload path or header name as written, for error messages.
+    kinds: tuple[SegmentKind, ...]
+    values: tuple[Any, ...]
+    sources: tuple[str, ...]
+    has_header_variables: bool = False
+    # Full output for templates without http variables
+    static_text: str | None = None
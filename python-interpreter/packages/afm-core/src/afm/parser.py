@@ -14,6 +14,8 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import functools
+import re
 from pathlib import Path
 
 import yaml
@@ -23,9 +25,23 @@ from .exceptions import AFMParseError, AFMValidationError
 from .models import AFMRecord, AgentMetadata
 from .variables import resolve_variables, validate_http_variables
 
+try:
+    # libyaml-backed loader, much faster on large frontmatter
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 # Delimiter for YAML frontmatter
 FRONTMATTER_DELIMITER = "---"
 
+# A level-1 markdown heading line, e.g. "# Role". The named groups flag
+# the two section headings so no heading text has to be lowercased.
+_HEADING_RE = re.compile(
+    r"^[^\S\n]*# [^\S\n]*(?:(?P<role>role)|(?P<instructions>instructions)|\S.*?)"
+    r"[^\S\n]*$",
+    re.MULTILINE | re.IGNORECASE,
+)
+
 
 def extract_raw_frontmatter(content: str) -> tuple[dict | None, str]:
     """Extract raw YAML frontmatter dict and remaining body from a content string.
@@ -55,7 +71,7 @@ def extract_raw_frontmatter(content: str) -> tuple[dict | None, str]:
         return {}, body
 
     try:
-        yaml_data = yaml.safe_load(yaml_content)
+        yaml_data = yaml.load(yaml_content, Loader=_SafeLoader)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML in frontmatter: {e}") from e
 
@@ -71,6 +87,12 @@ def extract_raw_frontmatter(content: str) -> tuple[dict | None, str]:
 def parse_afm(content: str, *, resolve_env: bool = True) -> AFMRecord:
     if resolve_env:
         content = resolve_variables(content)
+    # Callers may mutate the record (e.g. source_dir), so hand out a copy
+    return _parse_resolved_afm(content).model_copy(deep=True)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_resolved_afm(content: str) -> AFMRecord:
     lines = content.splitlines()
     metadata, body_start = _extract_frontmatter(lines)
     role, instructions = _extract_role_and_instructions(lines, body_start)
@@ -85,12 +107,19 @@ def parse_afm(content: str, *, resolve_env: bool = True) -> AFMRecord:
 
 def parse_afm_file(file_path: str | Path, *, resolve_env: bool = True) -> AFMRecord:
     path = Path(file_path).resolve()
-    content = path.read_text(encoding="utf-8")
+    stat = path.stat()
+    content = _read_afm_file(path, stat.st_mtime_ns, stat.st_size)
     record = parse_afm(content, resolve_env=resolve_env)
     record.source_dir = path.parent
     return record
 
 
+@functools.lru_cache(maxsize=32)
+def _read_afm_file(path: Path, mtime_ns: int, size: int) -> str:
+    # Keyed on mtime and size so an edited file is read again
+    return path.read_text(encoding="utf-8")
+
+
 def _extract_frontmatter(lines: list[str]) -> tuple[AgentMetadata, int]:
     content = "\n".join(lines)
     try:
@@ -125,37 +154,19 @@ def _extract_frontmatter(lines: list[str]) -> tuple[AgentMetadata, int]:
 def _extract_role_and_instructions(
     lines: list[str], start_index: int
 ) -> tuple[str, str]:
-    role_lines: list[str] = []
-    instructions_lines: list[str] = []
-
-    in_role = False
-    in_instructions = False
-
-    for i in range(start_index, len(lines)):
-        line = lines[i]
-        stripped = line.strip()
-
-        if stripped.startswith("# "):
-            heading = stripped[2:].strip().lower()
-            if heading == "role":
-                in_role = True
-                in_instructions = False
-                continue
-            elif heading == "instructions":
-                in_role = False
-                in_instructions = True
-                continue
-            else:
-                # Different heading - stop current section
-                in_role = False
-                in_instructions = False
-
-        if in_role:
-            role_lines.append(line)
-        elif in_instructions:
-            instructions_lines.append(line)
-
-    role = "\n".join(role_lines).strip()
-    instructions = "\n".join(instructions_lines).strip()
+    body = "\n".join(lines[start_index:])
+    sections: dict[str, list[str]] = {"role": [], "instructions": []}
+
+    headings = list(_HEADING_RE.finditer(body))
+    for i, heading in enumerate(headings):
+        if heading.lastgroup is None:
+            # Other headings end the current section
+            continue
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(body)
+        # Skip the heading's own newline; keep each content line's newline
+        sections[heading.lastgroup].append(body[heading.end() + 1 : end])
+
+    role = "".join(sections["role"]).strip()
+    instructions = "".join(sections["instructions"]).strip()
 
     return role, instructions
@@ -14,6 +14,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import copy
 import json
 import re
 from typing import Any
@@ -29,18 +30,31 @@ GENERIC_BLOCK_PATTERN = re.compile(r"```\s*([\s\S]*?)\s*```")
 
 
 def json_schema_to_dict(schema: JSONSchema) -> dict[str, Any]:
+    # A copy, so callers cannot change the cached form used for validation
+    return copy.deepcopy(_cached_schema_dict(schema))
+
+
+def _cached_schema_dict(schema: JSONSchema) -> dict[str, Any]:
+    # JSONSchema is frozen, so convert each one only once rather than on
+    # every validation. The result is shared and must not be mutated.
+    if schema._schema_dict is None:
+        schema._schema_dict = _build_schema_dict(schema)
+    return schema._schema_dict
+
+
+def _build_schema_dict(schema: JSONSchema) -> dict[str, Any]:
     result: dict[str, Any] = {"type": schema.type}
 
     if schema.properties is not None:
         result["properties"] = {
-            name: json_schema_to_dict(prop) for name, prop in schema.properties.items()
+            name: _cached_schema_dict(prop) for name, prop in schema.properties.items()
         }
 
     if schema.required is not None:
         result["required"] = schema.required
 
     if schema.items is not None:
-        result["items"] = json_schema_to_dict(schema.items)
+        result["items"] = _cached_schema_dict(schema.items)
 
     if schema.description is not None:
         result["description"] = schema.description
@@ -52,7 +66,7 @@ def json_schema_to_dict(schema: JSONSchema) -> dict[str, Any]:
         if value is not None:
             original = getattr(schema, key, None)
             if isinstance(original, JSONSchema):
-                result[key] = json_schema_to_dict(original)
+                result[key] = _cached_schema_dict(original)
             else:
                 result[key] = value
 
@@ -60,7 +74,7 @@ def json_schema_to_dict(schema: JSONSchema) -> dict[str, Any]:
 
 
 def validate_input(data: Any, schema: JSONSchema) -> None:
-    schema_dict = json_schema_to_dict(schema)
+    schema_dict = _cached_schema_dict(schema)
     try:
         jsonschema.validate(instance=data, schema=schema_dict)
     except JsonSchemaValidationError as e:
@@ -69,7 +83,7 @@ def validate_input(data: Any, schema: JSONSchema) -> None:
 
 
 def validate_output(data: Any, schema: JSONSchema) -> None:
-    schema_dict = json_schema_to_dict(schema)
+    schema_dict = _cached_schema_dict(schema)
     try:
         jsonschema.validate(instance=data, schema=schema_dict)
     except JsonSchemaValidationError as e:
@@ -117,7 +131,7 @@ def coerce_output_to_schema(
 
 
 def build_output_schema_instruction(schema: JSONSchema) -> str:
-    schema_dict = json_schema_to_dict(schema)
+    schema_dict = _cached_schema_dict(schema)
     schema_json = json.dumps(schema_dict, indent=2)
 
     return f"""
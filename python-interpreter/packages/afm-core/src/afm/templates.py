@@ -16,64 +16,81 @@
 
 from __future__ import annotations
 
+import functools
 import json
-from collections.abc import Mapping
+import re
+from collections.abc import Callable, Mapping
 from typing import Any
 
+from orjson import JSONEncodeError
+from orjson import dumps as orjson_dumps
+
 from .exceptions import (
     JSONAccessError,
     TemplateCompilationError,
     TemplateEvaluationError,
 )
-from .models import (
-    CompiledTemplate,
-    HeaderVariable,
-    LiteralSegment,
-    PayloadVariable,
-    TemplateSegment,
-)
-
-
-def compile_template(template: str) -> CompiledTemplate:
-    segments: list[TemplateSegment] = []
-    pos = 0
-
-    while pos < len(template):
-        dollar_pos = template.find("${", pos)
+from .models import CompiledTemplate, SegmentKind
 
-        if dollar_pos == -1:
-            if pos < len(template):
-                segments.append(LiteralSegment(text=template[pos:]))
-            break
+_VARIABLE_RE = re.compile(r"\$\{([^}]*)\}")
 
-        close_pos = template.find("}", dollar_pos)
+# Returned by payload accessors when the path does not resolve
+_MISSING = object()
 
-        if close_pos == -1:
-            if pos < len(template):
-                segments.append(LiteralSegment(text=template[pos:]))
-            break
 
-        if dollar_pos > pos:
-            segments.append(LiteralSegment(text=template[pos:dollar_pos]))
+# CompiledTemplate is frozen, so compiled results can be shared between callers
+@functools.lru_cache(maxsize=1024)
+def compile_template(template: str) -> CompiledTemplate:
+    kinds: list[SegmentKind] = []
+    values: list[Any] = []
+    sources: list[str] = []
+    pos = 0
 
-        var_expr = template[dollar_pos + 2 : close_pos]
+    for match in _VARIABLE_RE.finditer(template):
+        if match.start() > pos:
+            kinds.append("literal")
+            values.append(template[pos : match.start()])
+            sources.append("")
 
+        var_expr = match.group(1)
         if var_expr.startswith("http:"):
             http_part = var_expr[5:]  # Remove "http:" prefix
-            segment = _parse_http_variable(http_part, var_expr)
-            segments.append(segment)
+            kind, value, source = _parse_http_variable(http_part, var_expr)
+            kinds.append(kind)
+            values.append(value)
+            sources.append(source)
         else:
-            segments.append(LiteralSegment(text=f"${{{var_expr}}}"))
-
-        pos = close_pos + 1
-
-    return CompiledTemplate(segments=tuple(segments))
+            kinds.append("literal")
+            values.append(match.group(0))
+            sources.append("")
+
+        pos = match.end()
+
+    # Trailing text, including any unclosed "${"
+    if pos < len(template):
+        kinds.append("literal")
+        values.append(template[pos:])
+        sources.append("")
+
+    static_text = None
+    if all(kind == "literal" for kind in kinds):
+        static_text = "".join(values)
+
+    return CompiledTemplate(
+        kinds=tuple(kinds),
+        values=tuple(values),
+        sources=tuple(sources),
+        has_header_variables="header" in kinds,
+        static_text=static_text,
+    )
 
 
-def _parse_http_variable(http_part: str, full_expr: str) -> TemplateSegment:
+def _parse_http_variable(
+    http_part: str, full_expr: str
+) -> tuple[SegmentKind, Any, str]:
     if http_part == "payload":
         # Entire payload
-        return PayloadVariable(path="")
+        return "payload", _resolve_whole_payload, ""
 
     if http_part.startswith("payload."):
         path = http_part[8:]  # Remove "payload."
@@ -82,7 +99,13 @@ def _parse_http_variable(http_part: str, full_expr: str) -> TemplateSegment:
                 f"Invalid http variable format: {full_expr}",
                 template=full_expr,
             )
-        return PayloadVariable(path=path)
+        try:
+            tokens = _parse_path(path)
+        except JSONAccessError:
+            # A malformed path never resolves. It is reported per request as
+            # a missing field, as before, rather than failing at startup
+            return "payload", _resolve_nothing, path
+        return "payload", _build_accessor(tokens), path
 
     if http_part.startswith("header."):
         header_name = http_part[7:]  # Remove "header."
@@ -91,7 +114,7 @@ def _parse_http_variable(http_part: str, full_expr: str) -> TemplateSegment:
                 f"Invalid http variable format: {full_expr}",
                 template=full_expr,
             )
-        return HeaderVariable(name=header_name)
+        return "header", header_name.lower(), header_name
 
     # Unknown prefix
     prefix = http_part.split(".")[0] if "." in http_part else http_part
@@ -106,191 +129,207 @@ def evaluate_template(
     payload: Any,
     headers: Mapping[str, str | list[str]] | None,
 ) -> str:
-    parts: list[str] = []
-
-    for segment in compiled.segments:
-        match segment:
-            case LiteralSegment(text=text):
-                parts.append(text)
-            case PayloadVariable():
-                _handle_payload_variable(payload, parts, segment)
-            case HeaderVariable():
-                _handle_header_variable(headers, parts, segment)
+    if compiled.static_text is not None:
+        return compiled.static_text
+
+    lowered_headers: dict[str, str | list[str]] | None = None
+    # Only templates that reference headers pay for lowering them
+    if compiled.has_header_variables and headers is not None:
+        lowered_headers = _lower_header_names(headers)
+
+    # Literal slots already hold their text; only variables are filled in
+    parts: list[Any] = list(compiled.values)
+    sources = compiled.sources
+    for i, kind in enumerate(compiled.kinds):
+        if kind == "payload":
+            parts[i] = _evaluate_payload_variable(payload, parts[i], sources[i])
+        elif kind == "header":
+            parts[i] = _evaluate_header_variable(lowered_headers, parts[i], sources[i])
 
     return "".join(parts)
 
 
-def _handle_payload_variable(
+def _lower_header_names(
+    headers: Mapping[str, str | list[str]],
+) -> dict[str, str | list[str]]:
+    lowered: dict[str, str | list[str]] = {}
+    for key, value in headers.items():
+        # Keep the first occurrence, as the previous linear scan did
+        lowered.setdefault(key.lower(), value)
+    return lowered
+
+
+def _evaluate_payload_variable(
     payload: Any,
-    parts: list[str],
-    segment: PayloadVariable,
-) -> None:
-    if segment.path == "":
+    accessor: Callable[[Any], Any],
+    path: str,
+) -> str:
+    if path == "":
         # Entire payload
-        parts.append(json.dumps(payload))
-        return
+        return _dump_json(payload)
 
-    try:
-        value = access_json_field(payload, segment.path)
-        if isinstance(value, str):
-            parts.append(value)
-        else:
-            parts.append(json.dumps(value))
-    except JSONAccessError as e:
+    value = accessor(payload)
+    if value is _MISSING:
         raise TemplateEvaluationError(
-            f"Cannot resolve payload variable '${{http:payload.{segment.path}}}': "
+            f"Cannot resolve payload variable '${{http:payload.{path}}}': "
             f"field not found",
-            template=f"http:payload.{segment.path}",
-        ) from e
+            template=f"http:payload.{path}",
+        )
+    if isinstance(value, str):
+        return value
+    return _dump_json(value)
 
 
-def _handle_header_variable(
-    headers: Mapping[str, str | list[str]] | None,
-    parts: list[str],
-    segment: HeaderVariable,
-) -> None:
-    if headers is None:
+def _dump_json(value: Any) -> str:
+    try:
+        return orjson_dumps(value).decode()
+    except JSONEncodeError:
+        # orjson rejects integers wider than 64 bits, which json.loads accepts
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _evaluate_header_variable(
+    lowered_headers: Mapping[str, str | list[str]] | None,
+    name_lower: str,
+    name: str,
+) -> str:
+    if lowered_headers is None:
         raise TemplateEvaluationError(
-            f"Cannot resolve header variable '${{http:header.{segment.name}}}': "
+            f"Cannot resolve header variable '${{http:header.{name}}}': "
             "no headers provided",
-            template=f"http:header.{segment.name}",
+            template=f"http:header.{name}",
         )
 
     # Case-insensitive header lookup
-    header_name_lower = segment.name.lower()
-    for key, value in headers.items():
-        if key.lower() == header_name_lower:
-            if isinstance(value, list):
-                parts.append(", ".join(value))
-            else:
-                parts.append(value)
-            return
+    value = lowered_headers.get(name_lower)
+    if value is not None:
+        if isinstance(value, list):
+            return ", ".join(value)
+        return value
 
     # Header not found
     raise TemplateEvaluationError(
-        f"Cannot resolve header variable '${{http:header.{segment.name}}}': "
-        f"header not found",
-        template=f"http:header.{segment.name}",
+        f"Cannot resolve header variable '${{http:header.{name}}}': header not found",
+        template=f"http:header.{name}",
     )
 
 
 def access_json_field(payload: Any, path: str) -> Any:
     if not path:
         return payload
+    return _resolve_path(payload, _parse_path(path), path)
 
+
+def _resolve_path(payload: Any, tokens: tuple[str | int, ...], path: str) -> Any:
     current = payload
-    remaining = path
-
-    while remaining:
-        # Check for bracket notation at start
-        if remaining.startswith("["):
-            current, remaining = _handle_bracket_access(current, remaining)
-        elif remaining.startswith("."):
-            if remaining.startswith(".."):
+    for token in tokens:
+        if isinstance(token, str):
+            if not isinstance(current, dict):
+                raise JSONAccessError(
+                    f"Cannot access field '{token}' on non-object",
+                    path=path,
+                )
+            if token not in current:
                 raise JSONAccessError(
-                    f"Empty field name in path: {remaining}",
-                    path=remaining,
+                    f"Field '{token}' not found",
+                    path=path,
                 )
-            # Skip leading dot
-            remaining = remaining[1:]
         else:
-            # Dot notation - find next delimiter
-            current, remaining = _handle_dot_notation(current, remaining)
-
+            if not isinstance(current, list):
+                raise JSONAccessError(
+                    f"Cannot access index {token} on non-array",
+                    path=path,
+                )
+            if token < 0 or token >= len(current):
+                raise JSONAccessError(
+                    f"Array index out of bounds: {token}",
+                    path=path,
+                )
+        current = current[token]
     return current
 
 
-def _handle_bracket_access(current: Any, remaining: str) -> tuple[Any, str]:
-    # Find closing bracket
-    close_bracket = remaining.find("]")
-    if close_bracket == -1:
-        raise JSONAccessError(
-            f"Invalid bracket notation in path: {remaining}",
-            path=remaining,
-        )
+def _resolve_whole_payload(payload: Any) -> Any:
+    return payload
 
-    bracket_content = remaining[1:close_bracket]
-    new_remaining = remaining[close_bracket + 1 :]
-
-    # Check if it's a quoted string or array index
-    if (bracket_content.startswith("'") and bracket_content.endswith("'")) or (
-        bracket_content.startswith('"') and bracket_content.endswith('"')
-    ):
-        # Quoted field name
-        field_name = bracket_content[1:-1]
-        if not isinstance(current, dict):
-            raise JSONAccessError(
-                f"Cannot access field '{field_name}' on non-object",
-                path=remaining,
-            )
-        if field_name not in current:
-            raise JSONAccessError(
-                f"Field '{field_name}' not found",
-                path=remaining,
-            )
-        return current[field_name], new_remaining
-    else:
-        # Array index
-        try:
-            index = int(bracket_content)
-        except ValueError as err:
-            raise JSONAccessError(
-                f"Invalid array index: {bracket_content}",
-                path=remaining,
-            ) from err
-
-        if not isinstance(current, list):
-            raise JSONAccessError(
-                f"Cannot access index {index} on non-array",
-                path=remaining,
-            )
-        if index < 0 or index >= len(current):
-            raise JSONAccessError(
-                f"Array index out of bounds: {index}",
-                path=remaining,
-            )
-        return current[index], new_remaining
-
-
-def _handle_dot_notation(current: Any, remaining: str) -> tuple[Any, str]:
-    # Find next delimiter (., [, or end of string)
-    dot_pos = remaining.find(".")
-    bracket_pos = remaining.find("[")
-
-    if dot_pos == -1 and bracket_pos == -1:
-        # No more delimiters - this is the final field
-        field_name = remaining
-        new_remaining = ""
-    elif dot_pos == -1:
-        # Only bracket found
-        field_name = remaining[:bracket_pos]
-        new_remaining = remaining[bracket_pos:]
-    elif bracket_pos == -1:
-        # Only dot found
-        field_name = remaining[:dot_pos]
-        new_remaining = remaining[dot_pos:]
-    else:
-        # Both found - use whichever comes first
-        delimiter_pos = min(dot_pos, bracket_pos)
-        field_name = remaining[:delimiter_pos]
-        new_remaining = remaining[delimiter_pos:]
-
-    if not field_name:
-        # Empty field name (e.g., from ".." or ".[")
-        raise JSONAccessError(
-            f"Empty field name in path: {remaining}",
-            path=remaining,
-        )
 
-    if not isinstance(current, dict):
-        raise JSONAccessError(
-            f"Cannot access field '{field_name}' on non-object",
-            path=remaining,
-        )
-    if field_name not in current:
-        raise JSONAccessError(
-            f"Field '{field_name}' not found",
-            path=remaining,
-        )
+def _resolve_nothing(payload: Any) -> Any:
+    return _MISSING
+
 
-    return current[field_name], new_remaining
+def _build_accessor(tokens: tuple[str | int, ...]) -> Callable[[Any], Any]:
+    """Generate a function that indexes straight down *tokens*.
+
+    The function returns _MISSING instead of raising when a step fails. Tokens
+    come from _parse_path, so they are only ever str or int and their reprs
+    are plain literals.
+    """
+    lines = ["def access(v):", "    try:"]
+    for token in tokens:
+        if isinstance(token, str):
+            # Subscripting a list, str or scalar with a str raises TypeError
+            lines.append(f"        v = v[{token!r}]")
+        elif token < 0:
+            lines.append("        return _MISSING")
+        else:
+            # Strings accept int indices, so require an actual list
+            lines.append("        if not isinstance(v, list): return _MISSING")
+            lines.append(f"        v = v[{token!r}]")
+    lines.append("    except (KeyError, IndexError, TypeError):")
+    lines.append("        return _MISSING")
+    lines.append("    return v")
+
+    namespace: dict[str, Any] = {"_MISSING": _MISSING}
+    exec("\n".join(lines), namespace)  # noqa: S102
+    return namespace["access"]
+
+
+def _parse_path(path: str) -> tuple[str | int, ...]:
+    # Field names become str tokens and array indices become int tokens.
+    # Accepts what the path walker always has: a dot may be followed by a
+    # bracket or end the path, and bracket indices go through int(), so
+    # surrounding whitespace is allowed.
+    tokens: list[str | int] = []
+    pos = 0
+    end = len(path)
+    while pos < end:
+        char = path[pos]
+        if char == "[":
+            close = path.find("]", pos)
+            if close == -1:
+                raise JSONAccessError(
+                    f"Invalid bracket notation in path: {path[pos:]}",
+                    path=path[pos:],
+                )
+            content = path[pos + 1 : close]
+            if (content.startswith("'") and content.endswith("'")) or (
+                content.startswith('"') and content.endswith('"')
+            ):
+                # Quoted field name
+                tokens.append(content[1:-1])
+            else:
+                try:
+                    tokens.append(int(content))
+                except ValueError as err:
+                    raise JSONAccessError(
+                        f"Invalid array index: {content}",
+                        path=path[pos:],
+                    ) from err
+            pos = close + 1
+        elif char == ".":
+            if path.startswith("..", pos):
+                raise JSONAccessError(
+                    f"Empty field name in path: {path[pos:]}",
+                    path=path[pos:],
+                )
+            pos += 1
+        else:
+            # A field name runs to the next dot or bracket
+            stop = end
+            for delimiter in ".[":
+                found = path.find(delimiter, pos, stop)
+                if found != -1:
+                    stop = found
+            tokens.append(path[pos:stop])
+            pos = stop
+    return tuple(tokens)
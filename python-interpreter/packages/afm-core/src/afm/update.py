@@ -37,6 +37,7 @@ Three installation scenarios are handled:
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import os
@@ -67,6 +68,7 @@ def _is_docker() -> bool:
     return os.environ.get("AFM_RUNTIME", "").strip().lower() == "docker"
 
 
+@functools.lru_cache(maxsize=1)
 def _get_installed_version() -> str | None:
     """Get the installed version of the relevant AFM package."""
     try:
@@ -78,6 +80,25 @@ def _get_installed_version() -> str | None:
         return None
 
 
+def _state_file_path() -> Path:
+    """Return the path of the update state file."""
+    from platformdirs import user_config_dir
+
+    return Path(user_config_dir("afm")) / "update_state.json"
+
+
+def _state_file_is_fresh(path: Path) -> bool:
+    """True if the state file was written within the last CHECK_INTERVAL.
+
+    Every background check rewrites the file, so its mtime is enough to tell
+    that no check is due without opening and parsing it.
+    """
+    try:
+        return (time.time() - path.stat().st_mtime) < CHECK_INTERVAL
+    except OSError:
+        return False
+
+
 class UpdateState:
     """Manages persistent state for update checks.
 
@@ -102,12 +123,15 @@ class UpdateState:
     _PACKAGE_DEFAULTS: dict = {"last_check": 0, "latest_version": None}
 
     def __init__(self, package: str) -> None:
-        from platformdirs import user_config_dir
-
         self.package = package
-        self.path = Path(user_config_dir("afm")) / "update_state.json"
+        self.path = _state_file_path()
         logger.debug("Update state file path: %s", self.path)
+        # Taken before reading, so a write that races the read still shows
+        # up as a change on the next lookup
+        self._loaded_signature = _file_signature(self.path)
         self._root = self._load_root()
+        # Serialized form of what is on disk, so unchanged state is not rewritten
+        self._saved = json.dumps(self._root)
         self.data: dict = self._root["packages"].setdefault(
             package, dict(self._PACKAGE_DEFAULTS)
         )
@@ -137,12 +161,22 @@ class UpdateState:
         return {"packages": {}}
 
     def save(self) -> None:
-        """Persist current state to disk."""
+        """Persist current state to disk if it changed since it was loaded."""
+        content = json.dumps(self._root)
+        if content == self._saved:
+            logger.debug("Update state unchanged, not saving")
+            return
         try:
             self.path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.path, "w") as f:
-                json.dump(self._root, f)
+            # Write a sibling file and swap it in so readers never see a
+            # partially written state file
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(content)
+            os.replace(tmp_path, self.path)
+            self._saved = content
             logger.debug("Saved update state to %s: %s", self.path, self._root)
+            # Cached states for other packages now hold a stale root
+            _STATE_CACHE.clear()
         except OSError as exc:
             logger.debug("Failed to save update state: %s", exc)
 
@@ -153,6 +187,31 @@ class UpdateState:
         return (time.time() - last) >= CHECK_INTERVAL
 
 
+# States already loaded in this process, keyed by package name
+_STATE_CACHE: dict[str, UpdateState] = {}
+
+
+def _file_signature(path: Path) -> tuple[int, int, int] | None:
+    """Return (inode, mtime_ns, size) for *path*, or None if it cannot be read."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _get_state(package: str) -> UpdateState:
+    """Return the update state for *package*, re-reading the file only if it changed.
+
+    The background check runs in another process, so a cached state is
+    reused only while the file on disk is the one it was loaded from.
+    """
+    state = _STATE_CACHE.get(package)
+    if state is None or state._loaded_signature != _file_signature(state.path):
+        state = _STATE_CACHE[package] = UpdateState(package)
+    return state
+
+
 def _get_package_manager() -> str:
     """Determine the package manager used to install the CLI."""
     executable = sys.executable
@@ -214,7 +273,11 @@ def maybe_check_for_updates() -> None:
         return
 
     try:
-        state = UpdateState(_detect_package())
+        if _state_file_is_fresh(_state_file_path()):
+            logger.debug("Update check not due yet (state file is recent)")
+            return
+
+        state = _get_state(_detect_package())
         if not state.is_check_due:
             logger.debug(
                 "Update check not due yet (last: %.0f)", state.data.get("last_check", 0)
@@ -251,10 +314,8 @@ def get_update_notification() -> str | None:
         return None
 
     try:
-        from packaging.version import Version
-
         pkg = _detect_package()
-        state = UpdateState(pkg)
+        state = _get_state(pkg)
         latest = state.data.get("latest_version")
         if not latest:
             logger.debug("No latest version in state, skipping toast")
@@ -265,6 +326,9 @@ def get_update_notification() -> str | None:
             logger.debug("Could not determine installed version")
             return None
 
+        # Only pay for importing packaging once there is something to compare
+        from packaging.version import Version
+
         try:
             if Version(latest) <= Version(current):
                 logger.debug("Already up to date: %s >= %s", current, latest)
@@ -304,10 +368,8 @@ def notify_if_update_available() -> None:
         return
 
     try:
-        from packaging.version import Version
-
         pkg = _detect_package()
-        state = UpdateState(pkg)
+        state = _get_state(pkg)
         latest = state.data.get("latest_version")
         if not latest:
             logger.debug("No latest version in state, skipping notification")
@@ -318,6 +380,9 @@ def notify_if_update_available() -> None:
             logger.debug("Could not determine installed version")
             return
 
+        # Only pay for importing packaging once there is something to compare
+        from packaging.version import Version
+
         # Compare versions properly (handles pre-releases, etc.)
         try:
             if Version(latest) <= Version(current):
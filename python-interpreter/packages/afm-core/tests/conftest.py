@@ -14,41 +14,82 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from __future__ import annotations
+
 from pathlib import Path
 
 import pytest
+from afm import update
+
 
+@pytest.fixture(autouse=True)
+def reset_update_caches():
+    """Keep update state cached by one test from leaking into the next."""
+    update._STATE_CACHE.clear()
+    update._get_installed_version.cache_clear()
+    yield
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def fixtures_dir() -> Path:
     return Path(__file__).parent / "fixtures"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_agent_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_agent.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_consolechat_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_consolechat_agent.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_webhook_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_webhook_agent.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_minimal_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_minimal.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_no_frontmatter_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_no_frontmatter.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_stdio_mcp_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_stdio_mcp_agent.afm.md"
+
+
+@pytest.fixture(scope="session")
+def sample_agent_content(sample_agent_path: Path) -> str:
+    return sample_agent_path.read_bytes().decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_consolechat_content(sample_consolechat_path: Path) -> str:
+    return sample_consolechat_path.read_bytes().decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_webhook_content(sample_webhook_path: Path) -> str:
+    return sample_webhook_path.read_bytes().decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_minimal_content(sample_minimal_path: Path) -> str:
+    return sample_minimal_path.read_bytes().decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_no_frontmatter_content(sample_no_frontmatter_path: Path) -> str:
+    return sample_no_frontmatter_path.read_bytes().decode("utf-8")
+
+
+@pytest.fixture(scope="session")
+def sample_stdio_mcp_content(sample_stdio_mcp_path: Path) -> str:
+    return sample_stdio_mcp_path.read_bytes().decode("utf-8")
@@ -0,0 +1,34 @@
+# Copyright (c) 2025, WSO2 LLC. (https://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from afm.models import AFMRecord, Signature
+
+
+@dataclass
+class FakeAgent:
+    """Plain stand-in for AgentRunner in the HTTP interface tests."""
+
+    name: str
+    description: str | None
+    afm: AFMRecord
+    arun: Callable[..., Awaitable[Any]]
+    signature: Signature = field(default_factory=Signature)
@@ -14,17 +14,25 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import asyncio
 from importlib.metadata import PackageNotFoundError
 from importlib.metadata import version as meta_version
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import click
 import pytest
 from afm.cli import (
+    _run_async,
+    _run_http_and_console,
     cli,
     create_unified_app,
+    extract_interfaces,
 )
 from afm.models import (
+    AFMRecord,
+    AgentMetadata,
+    ConsoleChatInterface,
     Subscription,
     WebChatInterface,
     WebhookInterface,
@@ -160,6 +168,15 @@ Test
         result = runner.invoke(cli, ["run", str(invalid_file), "--dry-run"])
         assert result.exit_code != 0
 
+    def test_dry_run_leaves_logging_alone(
+        self, runner: CliRunner, sample_agent_path: Path
+    ):
+        with patch("afm.cli.logging.basicConfig") as basic_config:
+            result = runner.invoke(cli, ["run", str(sample_agent_path), "--dry-run"])
+
+        assert result.exit_code == 0
+        basic_config.assert_not_called()
+
 
 class TestCreateUnifiedApp:
     def test_requires_at_least_one_interface(self, sample_minimal_path: Path):
@@ -218,6 +235,41 @@ class TestCreateUnifiedApp:
         assert "/chat" in routes
         assert "/webhook" in routes
 
+    def test_docs_routes_served_with_webchat(self):
+        app = create_unified_app(
+            _make_mock_agent(), webchat_interface=WebChatInterface()
+        )
+
+        routes = {getattr(route, "path", None) for route in app.routes}
+        assert {"/docs", "/redoc", "/openapi.json"} <= routes
+
+    def test_docs_routes_off_for_webhook_only(self):
+        app = create_unified_app(
+            _make_mock_agent(),
+            webhook_interface=WebhookInterface(
+                subscription=Subscription(
+                    protocol="websub", hub="http://hub.example.com"
+                )
+            ),
+        )
+
+        routes = {getattr(route, "path", None) for route in app.routes}
+        assert not routes & {"/docs", "/redoc", "/openapi.json"}
+
+    def test_enable_docs_serves_docs_routes_for_webhook_only(self):
+        app = create_unified_app(
+            _make_mock_agent(),
+            webhook_interface=WebhookInterface(
+                subscription=Subscription(
+                    protocol="websub", hub="http://hub.example.com"
+                )
+            ),
+            enable_docs=True,
+        )
+
+        routes = {getattr(route, "path", None) for route in app.routes}
+        assert {"/docs", "/redoc", "/openapi.json"} <= routes
+
 
 class TestCLIIntegration:
     @patch("afm.cli.uvicorn")
@@ -370,6 +422,29 @@ Test
         assert result.exit_code != 0
 
 
+class TestExtractInterfaces:
+    def test_returns_one_interface_per_type(self):
+        webhook = WebhookInterface(subscription=Subscription(protocol="websub"))
+        console = ConsoleChatInterface()
+        afm = AFMRecord(
+            metadata=AgentMetadata(interfaces=[webhook, console]),
+            role="",
+            instructions="",
+        )
+
+        assert extract_interfaces(afm) == (console, None, webhook)
+
+    def test_duplicate_interface_type_raises(self):
+        afm = AFMRecord(
+            metadata=AgentMetadata(interfaces=[WebChatInterface(), WebChatInterface()]),
+            role="",
+            instructions="",
+        )
+
+        with pytest.raises(click.ClickException, match="Multiple interfaces"):
+            extract_interfaces(afm)
+
+
 class TestUnifiedAppLifespan:
     @pytest.mark.asyncio
     async def test_lifespan_cancels_subscription_task_on_shutdown(
@@ -411,6 +486,118 @@ class TestUnifiedAppLifespan:
             assert task.cancelled()
 
 
+class TestRunAsync:
+    def test_uses_uvloop_factory_when_available(self):
+        loops: list[asyncio.AbstractEventLoop] = []
+
+        def factory() -> asyncio.AbstractEventLoop:
+            loops.append(asyncio.new_event_loop())
+            return loops[-1]
+
+        async def main() -> None:
+            assert asyncio.get_running_loop() is loops[0]
+
+        with patch("afm.cli._new_event_loop", factory):
+            _run_async(main())
+
+        assert len(loops) == 1
+
+    def test_falls_back_to_default_loop(self):
+        async def main() -> None:
+            pass
+
+        with patch("afm.cli._new_event_loop", None):
+            _run_async(main())
+
+
+class _FakeServer:
+    """Stands in for uvicorn.Server, setting the startup event like the lifespan."""
+
+    def __init__(self, startup_event: asyncio.Event) -> None:
+        self.startup_event = startup_event
+        self.should_exit = False
+        self.shut_down = False
+        self.fail: BaseException | None = None
+        self.stop_early = False
+
+    async def serve(self) -> None:
+        if self.fail is not None:
+            raise self.fail
+        self.startup_event.set()
+        while not (self.should_exit or self.stop_early):
+            await asyncio.sleep(0)
+        self.shut_down = True
+
+
+class TestRunHttpAndConsole:
+    @pytest.fixture
+    def fake_server(self):
+        servers: list[_FakeServer] = []
+
+        def make_app(agent, **kwargs):
+            servers.append(_FakeServer(kwargs["startup_event"]))
+            return MagicMock()
+
+        with (
+            patch("afm.cli.create_unified_app", make_app),
+            patch("afm.cli.uvicorn.Config"),
+            patch("afm.cli.uvicorn.Server", side_effect=lambda config: servers[0]),
+        ):
+            yield servers
+
+    async def _run(self) -> None:
+        await _run_http_and_console(
+            _make_mock_agent(), WebChatInterface(), None, "127.0.0.1", 8000, False
+        )
+
+    @pytest.mark.asyncio
+    async def test_console_exit_shuts_server_down(self, fake_server, capsys):
+        with patch("afm.cli.async_run_console_chat", AsyncMock()) as chat:
+            await self._run()
+
+        chat.assert_awaited_once()
+        assert fake_server[0].shut_down
+        assert "stopped unexpectedly" not in capsys.readouterr().err
+
+    @pytest.mark.asyncio
+    async def test_console_error_still_shuts_server_down(self, fake_server):
+        chat = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with (
+            patch("afm.cli.async_run_console_chat", chat),
+            pytest.raises(RuntimeError, match="boom"),
+        ):
+            await self._run()
+
+        assert fake_server[0].shut_down
+
+    @pytest.mark.asyncio
+    async def test_server_stopping_ends_console(self, fake_server, capsys):
+        async def chat(agent):
+            fake_server[0].stop_early = True
+            await asyncio.sleep(3600)
+
+        with patch("afm.cli.async_run_console_chat", chat):
+            await asyncio.wait_for(self._run(), timeout=5)
+
+        assert "stopped unexpectedly" in capsys.readouterr().err
+
+    @pytest.mark.asyncio
+    async def test_startup_failure_propagates(self, fake_server):
+        def make_failing(config):
+            fake_server[0].fail = OSError("address already in use")
+            return fake_server[0]
+
+        with (
+            patch("afm.cli.uvicorn.Server", side_effect=make_failing),
+            patch("afm.cli.async_run_console_chat", AsyncMock()) as chat,
+            pytest.raises(OSError, match="address already in use"),
+        ):
+            await self._run()
+
+        chat.assert_not_called()
+
+
 class TestValidateWithEnvVariables:
     def test_validate_with_env_variables_succeeds_without_env_set(
         self, runner: CliRunner, tmp_path: Path
@@ -67,6 +67,12 @@ async def test_user_message_flow(mock_agent: MagicMock) -> None:
         assert len(user_msgs) == 1
         assert "Hello!" in str(user_msgs[0].render())
 
+        # The user bubble fits its text and sits against the right edge
+        user_region = user_msgs[0].region
+        log_region = chat_log.scrollable_content_region
+        assert user_region.width < log_region.width // 2
+        assert user_region.right == log_region.right
+
         # Check agent response
         agent_msgs = chat_log.query(".agent-message")
         assert len(agent_msgs) == 1
@@ -14,25 +14,38 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import copy
+import os
+import pickle
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+from pydantic import ValidationError
 
-from afm.exceptions import AFMParseError, AFMValidationError, VariableResolutionError
+from afm.exceptions import (
+    AFMParseError,
+    AFMValidationError,
+    InterfaceNotFoundError,
+    VariableResolutionError,
+)
+from afm.interfaces.base import get_webchat_interface
 from afm.models import (
+    AFMRecord,
+    AgentMetadata,
     ConsoleChatInterface,
     HttpTransport,
     StdioTransport,
     WebChatInterface,
     WebhookInterface,
+    parse_interface,
 )
 from afm.parser import parse_afm, parse_afm_file
 
 
 class TestParseAfm:
-    def test_parse_full_agent(self, sample_agent_path: Path) -> None:
-        content = sample_agent_path.read_text()
-        result = parse_afm(content)
+    def test_parse_full_agent(self, sample_agent_content: str) -> None:
+        result = parse_afm(sample_agent_content)
 
         assert result.metadata.spec_version == "0.3.0"
         assert result.metadata.name == "TestAgent"
@@ -79,9 +92,8 @@ class TestParseAfm:
             == "These are the instructions for the agent. They should also be parsed correctly."
         )
 
-    def test_parse_consolechat_agent(self, sample_consolechat_path: Path) -> None:
-        content = sample_consolechat_path.read_text()
-        result = parse_afm(content)
+    def test_parse_consolechat_agent(self, sample_consolechat_content: str) -> None:
+        result = parse_afm(sample_consolechat_content)
 
         assert result.metadata.name == "TestAgent"
         assert result.metadata.author == "Copilot"
@@ -101,9 +113,8 @@ class TestParseAfm:
         assert result.metadata.model.authentication.type == "bearer"
         assert result.metadata.model.authentication.token == "mock-token"
 
-    def test_parse_webhook_agent(self, sample_webhook_path: Path) -> None:
-        content = sample_webhook_path.read_text()
-        result = parse_afm(content)
+    def test_parse_webhook_agent(self, sample_webhook_content: str) -> None:
+        result = parse_afm(sample_webhook_content)
 
         assert result.metadata.name == "WebhookTestAgent"
 
@@ -121,17 +132,15 @@ class TestParseAfm:
         assert interface.subscription.protocol == "websub"
         assert interface.subscription.hub == "http://localhost:9193/websub/hub"
 
-    def test_parse_minimal_agent(self, sample_minimal_path: Path) -> None:
-        content = sample_minimal_path.read_text()
-        result = parse_afm(content)
+    def test_parse_minimal_agent(self, sample_minimal_content: str) -> None:
+        result = parse_afm(sample_minimal_content)
 
         assert result.metadata.spec_version == "0.3.0"
         assert result.role == "Agent role here."
         assert result.instructions == "Agent instructions here."
 
-    def test_parse_no_frontmatter(self, sample_no_frontmatter_path: Path) -> None:
-        content = sample_no_frontmatter_path.read_text()
-        result = parse_afm(content)
+    def test_parse_no_frontmatter(self, sample_no_frontmatter_content: str) -> None:
+        result = parse_afm(sample_no_frontmatter_content)
 
         # Should have empty metadata
         assert result.metadata.spec_version is None
@@ -152,6 +161,13 @@ The role.
             parse_afm(content)
         assert "Unclosed frontmatter" in str(exc_info.value)
 
+    def test_parse_error_keeps_line_when_copied(self) -> None:
+        error = AFMParseError("Unexpected token", line=3)
+
+        for restored in (pickle.loads(pickle.dumps(error)), copy.copy(error)):
+            assert restored.line == 3
+            assert str(restored) == "Line 3: Unexpected token"
+
     def test_parse_invalid_yaml(self) -> None:
         content = """---
 spec_version: "0.3.0"
@@ -257,6 +273,80 @@ These are the instructions.
         assert result.role == "This is the role."
         assert result.instructions == "These are the instructions."
 
+    def test_repeated_parse_returns_independent_records(
+        self, sample_agent_content: str
+    ) -> None:
+        content = sample_agent_content
+        first = parse_afm(content)
+        first.metadata.name = "Changed"
+        first.source_dir = Path("/tmp")
+
+        second = parse_afm(content)
+        assert second is not first
+        assert second.metadata.name == "TestAgent"
+        assert second.source_dir is None
+
+
+class TestParseInterface:
+    def test_dispatches_on_type(self) -> None:
+        interface = parse_interface({"type": "webchat"})
+
+        assert isinstance(interface, WebChatInterface)
+        assert interface.exposure.http is not None
+        assert interface.exposure.http.path == "/chat"
+
+    def test_unknown_type_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            parse_interface({"type": "carrier-pigeon"})
+
+    def test_only_tagged_variant_validated(self) -> None:
+        with pytest.raises(ValidationError) as exc_info:
+            parse_interface({"type": "webhook"})
+
+        # A discriminated union reports errors for the tagged model alone
+        assert {error["loc"][0] for error in exc_info.value.errors()} == {"webhook"}
+
+
+class TestInterfaceLookup:
+    def test_lookup_follows_interface_changes(self) -> None:
+        afm = AFMRecord(metadata=AgentMetadata(), role="", instructions="")
+
+        with pytest.raises(InterfaceNotFoundError):
+            get_webchat_interface(afm)
+
+        webchat = WebChatInterface()
+        afm.metadata.interfaces = [webchat]
+        assert get_webchat_interface(afm) is webchat
+
+        replacement = WebChatInterface()
+        afm.metadata.interfaces.insert(0, replacement)
+        assert get_webchat_interface(afm) is replacement
+
+        afm.metadata = AgentMetadata(interfaces=[ConsoleChatInterface()])
+        with pytest.raises(InterfaceNotFoundError):
+            get_webchat_interface(afm)
+
+    def test_lookup_follows_equal_replacement(self) -> None:
+        afm = AFMRecord(
+            metadata=AgentMetadata(interfaces=[WebChatInterface()]),
+            role="",
+            instructions="",
+        )
+        get_webchat_interface(afm)
+
+        # An equal list of new objects must not return the old ones
+        webchat = WebChatInterface()
+        afm.metadata.interfaces = [webchat]
+        assert get_webchat_interface(afm) is webchat
+
+    def test_index_is_reused_while_unchanged(self) -> None:
+        afm = AFMRecord(
+            metadata=AgentMetadata(interfaces=[WebChatInterface()]),
+            role="",
+            instructions="",
+        )
+        assert afm.interfaces_by_type() is afm.interfaces_by_type()
+
 
 class TestParseAfmFile:
     def test_parse_file(self, sample_agent_path: Path) -> None:
@@ -267,11 +357,28 @@ class TestParseAfmFile:
         with pytest.raises(FileNotFoundError):
             parse_afm_file("/nonexistent/path/agent.afm.md")
 
+    def test_parse_file_picks_up_edits(self, tmp_path: Path) -> None:
+        path = tmp_path / "agent.afm.md"
+        path.write_text("---\nname: First\n---\n# Role\nr\n# Instructions\ni\n")
+        assert parse_afm_file(path).metadata.name == "First"
+
+        path.write_text("---\nname: Second\n---\n# Role\nr\n# Instructions\ni\n")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+
+        assert parse_afm_file(path).metadata.name == "Second"
+
+    def test_parse_unchanged_file_reads_once(self, sample_agent_path: Path) -> None:
+        parse_afm_file(sample_agent_path)
+        with patch.object(Path, "read_text") as read_text:
+            result = parse_afm_file(sample_agent_path)
+
+        read_text.assert_not_called()
+        assert result.metadata.name == "TestAgent"
+
 
 class TestParseStdioMcpTransport:
-    def test_parse_stdio_mcp_agent(self, sample_stdio_mcp_path: Path) -> None:
-        content = sample_stdio_mcp_path.read_text()
-        result = parse_afm(content)
+    def test_parse_stdio_mcp_agent(self, sample_stdio_mcp_content: str) -> None:
+        result = parse_afm(sample_stdio_mcp_content)
 
         assert result.metadata.name == "StdioMcpAgent"
         assert result.metadata.tools is not None
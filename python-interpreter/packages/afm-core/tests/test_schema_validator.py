@@ -0,0 +1,57 @@
+# Copyright (c) 2025, WSO2 LLC. (https://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+from afm.exceptions import InputValidationError
+from afm.models import JSONSchema
+from afm.schema_validator import json_schema_to_dict, validate_input
+from pydantic import ValidationError
+
+
+def _object_schema() -> JSONSchema:
+    return JSONSchema(
+        type="object",
+        properties={"name": JSONSchema(type="string")},
+        required=["name"],
+    )
+
+
+class TestJsonSchemaToDict:
+    def test_converts_nested_schemas(self) -> None:
+        assert json_schema_to_dict(_object_schema()) == {
+            "type": "object",
+            "properties": {"name": {"type": "string"}},
+            "required": ["name"],
+        }
+
+    def test_returns_a_copy(self) -> None:
+        schema = _object_schema()
+        result = json_schema_to_dict(schema)
+        result["required"].append("age")
+        result["properties"]["name"]["type"] = "integer"
+
+        assert json_schema_to_dict(schema)["required"] == ["name"]
+        # Validation still uses the unchanged form
+        validate_input({"name": "Ada"}, schema)
+        with pytest.raises(InputValidationError):
+            validate_input({}, schema)
+
+    def test_schema_cannot_be_reassigned(self) -> None:
+        schema = _object_schema()
+        json_schema_to_dict(schema)
+
+        with pytest.raises(ValidationError):
+            schema.type = "string"
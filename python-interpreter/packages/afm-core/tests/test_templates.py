@@ -0,0 +1,178 @@
+# Copyright (c) 2025, WSO2 LLC. (https://www.wso2.com).
+#
+# WSO2 LLC. licenses this file to you under the Apache License,
+# Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+from afm.exceptions import (
+    JSONAccessError,
+    TemplateCompilationError,
+    TemplateEvaluationError,
+)
+from afm.templates import access_json_field, compile_template, evaluate_template
+
+
+class TestCompileTemplate:
+    def test_returns_cached_template(self) -> None:
+        template = "Event ${http:payload.event}"
+        assert compile_template(template) is compile_template(template)
+
+    def test_non_http_variable_kept_as_literal(self) -> None:
+        compiled = compile_template("Value: ${env:HOME}")
+        assert evaluate_template(compiled, {}, None) == "Value: ${env:HOME}"
+
+    def test_unclosed_variable_kept_as_literal(self) -> None:
+        compiled = compile_template("Value: ${http:payload.name")
+        assert evaluate_template(compiled, {}, None) == "Value: ${http:payload.name"
+
+    def test_unknown_http_prefix_raises(self) -> None:
+        with pytest.raises(TemplateCompilationError, match="Unknown http variable"):
+            compile_template("${http:query.name}")
+
+    def test_empty_payload_path_raises(self) -> None:
+        with pytest.raises(TemplateCompilationError):
+            compile_template("${http:payload.}")
+
+    def test_payload_path_compiled_to_accessor(self) -> None:
+        compiled = compile_template("${http:payload.a['b'][0].c}")
+        assert compiled.kinds == ("payload",)
+        assert compiled.values[0]({"a": {"b": [{"c": 5}]}}) == 5
+
+    def test_segments_split_into_parallel_tuples(self) -> None:
+        compiled = compile_template("Hi ${http:header.X-Name}!")
+        assert compiled.kinds == ("literal", "header", "literal")
+        assert compiled.values == ("Hi ", "x-name", "!")
+        assert compiled.sources == ("", "X-Name", "")
+        assert compiled.has_header_variables
+
+    def test_literal_only_template_is_static(self) -> None:
+        compiled = compile_template("Hello ${env:USER}!")
+        assert compiled.static_text == "Hello ${env:USER}!"
+        assert compile_template("${http:payload}").static_text is None
+
+    @pytest.mark.parametrize(
+        "template",
+        ["${http:payload.a[x]}", "${http:payload.a..b}", "${http:payload.a[0}"],
+    )
+    def test_invalid_payload_path_fails_at_evaluation(self, template: str) -> None:
+        # Compiling must not fail, so an agent with a bad path still starts
+        compiled = compile_template(template)
+        with pytest.raises(TemplateEvaluationError, match="field not found"):
+            evaluate_template(compiled, {"a": {"b": 1}}, None)
+
+    @pytest.mark.parametrize(
+        ("template", "payload", "expected"),
+        [
+            ("${http:payload.a.}", {"a": "x"}, "x"),
+            ("${http:payload.items[ 1 ]}", {"items": ["x", "y"]}, "y"),
+            ("${http:payload.items.[0]}", {"items": ["x"]}, "x"),
+            ("${http:payload.a['it's']}", {"a": {"it's": "x"}}, "x"),
+        ],
+    )
+    def test_lenient_path_syntax_accepted(
+        self, template: str, payload: object, expected: str
+    ) -> None:
+        compiled = compile_template(template)
+        assert evaluate_template(compiled, payload, None) == expected
+
+
+class TestEvaluateTemplate:
+    def test_substitutes_payload_and_headers(self) -> None:
+        compiled = compile_template(
+            "${http:payload.user.name} via ${http:header.User-Agent}"
+        )
+        result = evaluate_template(
+            compiled, {"user": {"name": "Ada"}}, {"user-agent": "curl/8.0"}
+        )
+        assert result == "Ada via curl/8.0"
+
+    def test_entire_payload_serialized(self) -> None:
+        compiled = compile_template("Payload: ${http:payload}")
+        assert evaluate_template(compiled, {"a": 1}, None) == 'Payload: {"a":1}'
+
+    def test_non_string_value_serialized(self) -> None:
+        compiled = compile_template("${http:payload.items}")
+        assert evaluate_template(compiled, {"items": [1, 2]}, None) == "[1,2]"
+
+    def test_large_integer_serialized(self) -> None:
+        compiled = compile_template("${http:payload.items}")
+        assert evaluate_template(compiled, {"items": [2**70]}, None) == f"[{2**70}]"
+
+    def test_list_header_joined(self) -> None:
+        compiled = compile_template("${http:header.Accept}")
+        headers = {"Accept": ["text/plain", "application/json"]}
+        assert (
+            evaluate_template(compiled, {}, headers) == "text/plain, application/json"
+        )
+
+    def test_header_lookup_prefers_first_match(self) -> None:
+        compiled = compile_template("${http:header.x-id} ${http:header.X-ID}")
+        headers = {"X-Id": "first", "x-id": "second"}
+        assert evaluate_template(compiled, {}, headers) == "first first"
+
+    def test_missing_header_raises(self) -> None:
+        compiled = compile_template("${http:header.X-Missing}")
+        with pytest.raises(TemplateEvaluationError, match="header not found"):
+            evaluate_template(compiled, {}, {"Accept": "text/plain"})
+
+    def test_no_headers_raises(self) -> None:
+        compiled = compile_template("${http:header.Accept}")
+        with pytest.raises(TemplateEvaluationError, match="no headers provided"):
+            evaluate_template(compiled, {}, None)
+
+    def test_missing_payload_field_raises(self) -> None:
+        compiled = compile_template("${http:payload.missing}")
+        with pytest.raises(TemplateEvaluationError, match="field not found"):
+            evaluate_template(compiled, {"present": 1}, None)
+
+    @pytest.mark.parametrize(
+        ("template", "payload"),
+        [
+            ("${http:payload.name[0]}", {"name": "Bob"}),
+            ("${http:payload.items[-1]}", {"items": [1, 2]}),
+            ("${http:payload.items.a}", {"items": [1, 2]}),
+            ("${http:payload.a.b}", {"a": None}),
+        ],
+    )
+    def test_invalid_payload_access_raises(
+        self, template: str, payload: object
+    ) -> None:
+        compiled = compile_template(template)
+        with pytest.raises(TemplateEvaluationError, match="field not found"):
+            evaluate_template(compiled, payload, None)
+
+
+class TestAccessJsonField:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("", {"a": {"b": [10, {"c.d": "x"}]}}),
+            ("a.b[0]", 10),
+            ("a.b[1]['c.d']", "x"),
+            ('a["b"][1]["c.d"]', "x"),
+            ("a.b", [10, {"c.d": "x"}]),
+        ],
+    )
+    def test_resolves_path(self, path: str, expected: object) -> None:
+        payload = {"a": {"b": [10, {"c.d": "x"}]}}
+        assert access_json_field(payload, path) == expected
+
+    @pytest.mark.parametrize(
+        "path",
+        ["a..b", "a.b[5]", "a.b[x]", "a.b[0", "a.b.c", "missing", "a.b[-1]"],
+    )
+    def test_invalid_path_raises(self, path: str) -> None:
+        payload = {"a": {"b": [10]}}
+        with pytest.raises(JSONAccessError):
+            access_json_field(payload, path)
@@ -18,6 +18,7 @@
 
 from __future__ import annotations
 
+import os
 import sys
 import time
 from pathlib import Path
@@ -35,6 +36,7 @@ from afm.update import (
     _detect_upgrade_command,
     _get_installed_version,
     _get_package_manager,
+    _get_state,
     _is_docker,
     _perform_background_check,
     get_update_notification,
@@ -161,6 +163,53 @@ class TestUpdateState:
         state.data["last_check"] = time.time() - CHECK_INTERVAL - 1
         assert state.is_check_due is True
 
+    def test_save_skips_unchanged_state(self, patch_config_dir: None, state_file: Path):
+        """Should not rewrite the file when nothing changed since loading."""
+        state = UpdateState("afm-cli")
+        state.data["latest_version"] = "0.2.0"
+        state.save()
+        stale = time.time() - CHECK_INTERVAL - 1
+        os.utime(state_file, (stale, stale))
+
+        UpdateState("afm-cli").save()
+        assert state_file.stat().st_mtime == pytest.approx(stale)
+
+    def test_save_leaves_no_temp_file(self, patch_config_dir: None, state_dir: Path):
+        """The temporary file used for the atomic write should be renamed away."""
+        state = UpdateState("afm-cli")
+        state.data["latest_version"] = "0.2.0"
+        state.save()
+        assert [p.name for p in state_dir.iterdir()] == ["update_state.json"]
+
+
+class TestGetState:
+    def test_state_is_cached(self, patch_config_dir: None):
+        """Repeated lookups should reuse the already-loaded state."""
+        assert _get_state("afm-cli") is _get_state("afm-cli")
+
+    def test_save_invalidates_cache(self, patch_config_dir: None):
+        """Saving should make the next lookup re-read the file."""
+        cached = _get_state("afm-cli")
+        state = UpdateState("afm-cli")
+        state.data["latest_version"] = "9.9.9"
+        state.save()
+
+        reloaded = _get_state("afm-cli")
+        assert reloaded is not cached
+        assert reloaded.data["latest_version"] == "9.9.9"
+
+    def test_write_from_another_process_is_picked_up(self, patch_config_dir: None):
+        """The background check writes the file without touching this cache."""
+        cached = _get_state("afm-cli")
+        assert cached.data["latest_version"] is None
+
+        cached.path.parent.mkdir(parents=True, exist_ok=True)
+        cached.path.write_text(
+            '{"packages": {"afm-cli": {"last_check": 1, "latest_version": "9.9.9"}}}'
+        )
+
+        assert _get_state("afm-cli").data["latest_version"] == "9.9.9"
+
 
 class TestDetectPackage:
     def test_returns_afm_cli_when_installed(self):
@@ -224,6 +273,42 @@ class TestMaybeCheckForUpdates:
         maybe_check_for_updates()
         mock_popen.assert_not_called()
 
+    @patch("afm.update.subprocess.Popen")
+    @patch("afm.update.UpdateState")
+    def test_fresh_state_file_not_parsed(
+        self,
+        mock_state: MagicMock,
+        mock_popen: MagicMock,
+        patch_config_dir: None,
+        state_file: Path,
+    ):
+        """A recently written state file should skip the check without loading it."""
+        state_file.parent.mkdir(parents=True)
+        state_file.write_text("{}")
+
+        maybe_check_for_updates()
+        mock_state.assert_not_called()
+        mock_popen.assert_not_called()
+
+    @patch("afm.update.subprocess.Popen")
+    @patch("afm.update._detect_package", return_value="afm-cli")
+    def test_check_spawns_when_state_file_stale(
+        self,
+        mock_pkg: MagicMock,
+        mock_popen: MagicMock,
+        patch_config_dir: None,
+        state_file: Path,
+    ):
+        """Should spawn subprocess when the state file predates the TTL."""
+        state = UpdateState("afm-cli")
+        state.data["last_check"] = time.time() - CHECK_INTERVAL - 1
+        state.save()
+        stale = time.time() - CHECK_INTERVAL - 1
+        os.utime(state_file, (stale, stale))
+
+        maybe_check_for_updates()
+        mock_popen.assert_called_once()
+
     @patch("afm.update.subprocess.Popen")
     def test_check_spawns_when_expired(
         self, mock_popen: MagicMock, patch_config_dir: None
@@ -681,6 +766,14 @@ class TestGetInstalledVersion:
         """Should return None if version lookup fails."""
         assert _get_installed_version() is None
 
+    @patch("afm.update._detect_package", return_value="afm-cli")
+    @patch("importlib.metadata.version", return_value="0.2.1")
+    def test_result_is_cached(self, mock_version: MagicMock, mock_detect: MagicMock):
+        """Should only look up package metadata once per process."""
+        assert _get_installed_version() == "0.2.1"
+        assert _get_installed_version() == "0.2.1"
+        mock_version.assert_called_once()
+
 
 class TestCLIUpdateIntegration:
     @patch("afm.update.notify_if_update_available")
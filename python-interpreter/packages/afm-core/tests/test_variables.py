@@ -14,6 +14,8 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import pickle
+
 import pytest
 
 from afm.exceptions import AFMValidationError, VariableResolutionError
@@ -39,6 +41,15 @@ class TestResolveVariables:
             resolve_variables("${env:NONEXISTENT_VAR_12345}")
         assert "NONEXISTENT_VAR_12345" in str(exc_info.value)
 
+    def test_error_keeps_message_in_args_and_pickles(self) -> None:
+        error = VariableResolutionError("env:TOKEN", "not set")
+
+        restored = pickle.loads(pickle.dumps(error))
+
+        assert error.args == ("Cannot resolve variable '${env:TOKEN}': not set",)
+        assert str(restored) == str(error)
+        assert (restored.variable, restored.reason) == ("env:TOKEN", "not set")
+
     def test_raises_error_for_unsupported_prefix(self) -> None:
         with pytest.raises(VariableResolutionError) as exc_info:
             resolve_variables("${unsupported:VAR}")
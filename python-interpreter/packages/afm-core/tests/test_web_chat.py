@@ -16,78 +16,107 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from collections import OrderedDict
 
+import orjson
 import pytest
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.testclient import TestClient
 
-from afm.runner import AgentRunner
-from afm.interfaces.web_chat import create_webchat_app
-from afm.models import JSONSchema, Signature
+from afm.interfaces.web_chat import (
+    _chat_object,
+    _chat_string,
+    _format_object_output,
+    _format_string_output,
+    _parse_object_input,
+    create_webchat_app,
+    create_webchat_router,
+)
+from afm.models import AFMRecord, AgentMetadata, JSONSchema, Signature
+from fake_agent import FakeAgent
+
+
+async def _echo_arun(input_data: str, session_id: str = "default") -> str:
+    return f"Response to: {input_data}"
+
+
+def _make_agent() -> FakeAgent:
+    return FakeAgent(
+        name="Test Agent",
+        description="A test agent for unit testing",
+        afm=AFMRecord(
+            metadata=AgentMetadata(version="1.0.0"),
+            role="",
+            instructions="",
+        ),
+        # Default string signature
+        signature=Signature(
+            input=JSONSchema(type="string"),
+            output=JSONSchema(type="string"),
+        ),
+        arun=_echo_arun,
+    )
 
 
 @pytest.fixture
-def mock_agent() -> MagicMock:
-    agent = MagicMock(spec=AgentRunner)
-    agent.name = "Test Agent"
-    agent.description = "A test agent for unit testing"
-    agent.afm = MagicMock()
-    agent.afm.metadata = MagicMock()
-    agent.afm.metadata.version = "1.0.0"
-    agent.afm.metadata.icon_url = None
-    agent.afm.metadata.interfaces = None
-
-    # Default string signature
-    agent.signature = Signature(
-        input=JSONSchema(type="string"),
-        output=JSONSchema(type="string"),
-    )
+def mock_agent() -> FakeAgent:
+    return _make_agent()
+
+
+@pytest.fixture(scope="module")
+def shared_chat_agent() -> FakeAgent:
+    return _make_agent()
 
-    # Mock async run
-    async def mock_arun(input_data: str, session_id: str = "default") -> str:
-        return f"Response to: {input_data}"
 
-    agent.arun = mock_arun
-    return agent
+@pytest.fixture(scope="module")
+def shared_chat_client(shared_chat_agent: FakeAgent) -> TestClient:
+    return TestClient(create_webchat_app(shared_chat_agent))
 
 
 @pytest.fixture
-def mock_agent_with_object_output() -> MagicMock:
-    agent = MagicMock(spec=AgentRunner)
-    agent.name = "Object Output Agent"
-    agent.description = "Returns structured data"
-    agent.afm = MagicMock()
-    agent.afm.metadata = MagicMock()
-    agent.afm.metadata.version = "1.0.0"
-    agent.afm.metadata.icon_url = None
-    agent.afm.metadata.interfaces = None
-
-    # Object output signature
-    agent.signature = Signature(
-        input=JSONSchema(type="string"),
-        output=JSONSchema(
-            type="object",
-            properties={
-                "response": JSONSchema(type="string"),
-                "confidence": JSONSchema(type="number"),
-            },
-        ),
-    )
+def chat_agent(shared_chat_agent: FakeAgent) -> FakeAgent:
+    # The app is built once per module, so undo any per-test override
+    shared_chat_agent.arun = _echo_arun
+    return shared_chat_agent
+
+
+@pytest.fixture
+def chat_client(chat_agent: FakeAgent, shared_chat_client: TestClient) -> TestClient:
+    return shared_chat_client
+
 
+@pytest.fixture
+def mock_agent_with_object_output() -> FakeAgent:
     # Mock async run returning dict
     async def mock_arun(input_data: str, session_id: str = "default") -> dict:
         return {"response": f"Response to: {input_data}", "confidence": 0.95}
 
-    agent.arun = mock_arun
-    return agent
+    return FakeAgent(
+        name="Object Output Agent",
+        description="Returns structured data",
+        afm=AFMRecord(
+            metadata=AgentMetadata(version="1.0.0"),
+            role="",
+            instructions="",
+        ),
+        # Object output signature
+        signature=Signature(
+            input=JSONSchema(type="string"),
+            output=JSONSchema(
+                type="object",
+                properties={
+                    "response": JSONSchema(type="string"),
+                    "confidence": JSONSchema(type="number"),
+                },
+            ),
+        ),
+        arun=mock_arun,
+    )
 
 
 class TestStringChat:
-    def test_chat_endpoint_responds(self, mock_agent: MagicMock) -> None:
-        app = create_webchat_app(mock_agent)
-        client = TestClient(app)
-
-        response = client.post(
+    def test_chat_endpoint_responds(self, chat_client: TestClient) -> None:
+        response = chat_client.post(
             "/chat",
             json="Hello!",
         )
@@ -95,10 +124,9 @@ class TestStringChat:
         assert response.status_code == 200
         assert response.text == "Response to: Hello!"
 
-    def test_chat_uses_session_id_header(self, mock_agent: MagicMock) -> None:
-        app = create_webchat_app(mock_agent)
-        client = TestClient(app)
-
+    def test_chat_uses_session_id_header(
+        self, chat_agent: FakeAgent, chat_client: TestClient
+    ) -> None:
         # Track session IDs
         sessions_used: list[str] = []
 
@@ -106,17 +134,17 @@ class TestStringChat:
             sessions_used.append(session_id)
             return f"Response: {input_data}"
 
-        mock_agent.arun = tracking_arun
+        chat_agent.arun = tracking_arun
 
         # First request without session
-        client.post(
+        chat_client.post(
             "/chat",
             content="msg1",
             headers={"Content-Type": "text/plain"},
         )
 
         # Second request with session
-        client.post(
+        chat_client.post(
             "/chat",
             content="msg2",
             headers={"X-Session-Id": "my-session-123"},
@@ -125,75 +153,116 @@ class TestStringChat:
         assert sessions_used[0] == "default"
         assert sessions_used[1] == "my-session-123"
 
-    def test_chat_empty_message_returns_400(self, mock_agent: MagicMock) -> None:
-        app = create_webchat_app(mock_agent)
-        client = TestClient(app)
-
-        response = client.post(
+    def test_chat_text_plain_with_charset(self, chat_client: TestClient) -> None:
+        response = chat_client.post(
             "/chat",
-            content="   ",
-            headers={"Content-Type": "text/plain"},
+            content="Hello!",
+            headers={"Content-Type": "Text/Plain; charset=utf-8"},
         )
 
-        assert response.status_code == 400
+        assert response.status_code == 200
+        assert response.text == "Response to: Hello!"
 
-    def test_chat_invalid_json_returns_400(self, mock_agent: MagicMock) -> None:
-        app = create_webchat_app(mock_agent)
-        client = TestClient(app)
 
-        response = client.post(
-            "/chat",
-            content="not json",
-            headers={"Content-Type": "application/json"},
+class TestChatStringHandler:
+    async def test_json_string_accepted(self, mock_agent: FakeAgent) -> None:
+        response = await _chat_string(
+            mock_agent, b'"Hello!"', "application/json", "default"
         )
 
-        assert response.status_code == 400
+        assert response == "Response to: Hello!"
+
+    @pytest.mark.parametrize(
+        ("body", "media_type"),
+        [
+            (b"   ", "text/plain"),
+            (b"not json", "application/json"),
+            (b'{"message": "Hello!"}', "application/json"),
+            (b"<message>Hello!</message>", "application/xml"),
+            (b"\xff", "text/plain"),
+        ],
+    )
+    async def test_bad_message_returns_400(
+        self, mock_agent: FakeAgent, body: bytes, media_type: str
+    ) -> None:
+        with pytest.raises(HTTPException) as exc_info:
+            await _chat_string(mock_agent, body, media_type, "default")
 
-    def test_chat_json_string_accepted(self, mock_agent: MagicMock) -> None:
-        app = create_webchat_app(mock_agent)
-        client = TestClient(app)
+        assert exc_info.value.status_code == 400
 
-        response = client.post(
-            "/chat",
-            json="Hello!",
+    async def test_agent_error_returns_500(self, mock_agent: FakeAgent) -> None:
+        async def failing_arun(input_data: str, session_id: str = "default") -> str:
+            raise Exception("Agent failed")
+
+        mock_agent.arun = failing_arun
+
+        with pytest.raises(HTTPException) as exc_info:
+            await _chat_string(mock_agent, b"Hello!", "text/plain", "default")
+
+        assert exc_info.value.status_code == 500
+        assert exc_info.value.detail == "Internal server error"
+
+
+class TestChatRouter:
+    def test_apps_with_same_shape_use_their_own_agent(
+        self, mock_agent: FakeAgent
+    ) -> None:
+        async def other_arun(input_data: str, session_id: str = "default") -> str:
+            return f"Other: {input_data}"
+
+        other_agent = FakeAgent(
+            name="Other Agent",
+            description=None,
+            afm=mock_agent.afm,
+            signature=mock_agent.signature,
+            arun=other_arun,
         )
+        first = create_webchat_app(mock_agent)
+        second = create_webchat_app(other_agent)
 
-        assert response.status_code == 200
-        assert response.text == "Response to: Hello!"
+        assert TestClient(first).post("/chat", json="Hi").text == "Response to: Hi"
+        assert TestClient(second).post("/chat", json="Hi").text == "Other: Hi"
 
-    def test_chat_json_object_rejected(self, mock_agent: MagicMock) -> None:
-        app = create_webchat_app(mock_agent)
-        client = TestClient(app)
+    def test_router_mounted_in_custom_app(self, mock_agent: FakeAgent) -> None:
+        calls: list[str] = []
 
-        response = client.post(
-            "/chat",
-            json={"message": "Hello!"},
+        def record_call() -> None:
+            calls.append("called")
+
+        app = FastAPI()
+        app.include_router(
+            create_webchat_router(mock_agent, mock_agent.signature, "/talk"),
+            prefix="/agent",
+            dependencies=[Depends(record_call)],
         )
 
-        assert response.status_code == 400
+        response = TestClient(app).post("/agent/talk", json="Hi")
 
-    def test_chat_agent_error_returns_500(self, mock_agent: MagicMock) -> None:
-        app = create_webchat_app(mock_agent)
-        client = TestClient(app)
+        assert response.text == "Response to: Hi"
+        assert calls == ["called"]
 
-        async def failing_arun(input_data: str, session_id: str = "default") -> str:
-            raise Exception("Agent failed")
+    def test_dependency_overrides_apply(self, mock_agent: FakeAgent) -> None:
+        def require_token() -> None:
+            raise HTTPException(status_code=401)
 
-        mock_agent.arun = failing_arun
+        def allow() -> None:
+            return None
 
-        response = client.post(
-            "/chat",
-            json="Hello!",
+        app = FastAPI()
+        app.include_router(
+            create_webchat_router(mock_agent, mock_agent.signature),
+            dependencies=[Depends(require_token)],
         )
+        client = TestClient(app)
 
-        assert response.status_code == 500
-        data = response.json()
-        assert data["detail"] == "Internal server error"
+        assert client.post("/chat", json="Hi").status_code == 401
+        app.dependency_overrides[require_token] = allow
+        assert client.post("/chat", json="Hi").text == "Response to: Hi"
 
 
 class TestObjectOutputChat:
     def test_object_output_returned(
-        self, mock_agent_with_object_output: MagicMock
+        self, mock_agent_with_object_output: FakeAgent
     ) -> None:
         app = create_webchat_app(mock_agent_with_object_output)
         client = TestClient(app)
@@ -208,20 +277,110 @@ class TestObjectOutputChat:
         assert data["response"] == "Response to: Hello!"
         assert data["confidence"] == 0.95
 
+    def test_object_output_with_large_integer(
+        self, mock_agent_with_object_output: FakeAgent
+    ) -> None:
+        async def mock_arun(input_data: str, session_id: str = "default") -> dict:
+            return {"response": input_data, "count": 2**70}
+
+        mock_agent_with_object_output.arun = mock_arun
+        client = TestClient(create_webchat_app(mock_agent_with_object_output))
+
+        response = client.post("/chat", json="Hello!")
+
+        assert response.status_code == 200
+        assert response.json()["count"] == 2**70
+
 
 class TestObjectInputChat:
-    def test_object_input_rejects_text_plain(self, mock_agent: MagicMock) -> None:
-        mock_agent.signature = Signature(
-            input=JSONSchema(type="object"),
-            output=JSONSchema(type="string"),
+    async def test_object_input_rejects_text_plain(self, mock_agent: FakeAgent) -> None:
+        with pytest.raises(HTTPException) as exc_info:
+            await _chat_object(
+                mock_agent,
+                b"Hello!",
+                "text/plain",
+                "default",
+                _parse_object_input,
+                _format_string_output,
+            )
+
+        assert exc_info.value.status_code == 400
+
+    async def test_object_input_wraps_string_output(
+        self, mock_agent: FakeAgent
+    ) -> None:
+        async def echo_arun(input_data: dict, session_id: str = "default") -> dict:
+            return input_data
+
+        mock_agent.arun = echo_arun
+
+        response = await _chat_object(
+            mock_agent,
+            b'{"message": "Hello!"}',
+            "application/json",
+            "default",
+            _parse_object_input,
+            _format_string_output,
         )
-        app = create_webchat_app(mock_agent)
+
+        assert response.status_code == 200
+        assert orjson.loads(response.body) == {"response": '{"message":"Hello!"}'}
+
+
+class TestChatUI:
+    def test_ui_renders_escaped_metadata(self, mock_agent: FakeAgent) -> None:
+        mock_agent.name = "<Agent>"
+        mock_agent.afm.metadata.icon_url = "https://example.com/icon.png"
+        app = create_webchat_app(mock_agent, path="/talk")
         client = TestClient(app)
 
-        response = client.post(
-            "/chat",
-            content="Hello!",
-            headers={"Content-Type": "text/plain"},
-        )
+        response = client.get("/chat/ui")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/html; charset=utf-8"
+        assert "&lt;Agent&gt;" in response.text
+        assert "https://example.com/icon.png" in response.text
+        assert '"/talk"' in response.text
+        assert "{{" not in response.text
+
+
+class _Text(str):
+    pass
+
+
+class TestFormatOutput:
+    def test_dict_subclass_returned_as_object(self) -> None:
+        response = _format_object_output(OrderedDict(status="ok"))
+
+        assert orjson.loads(response.body) == {"status": "ok"}
+
+    def test_str_subclass_not_requoted(self) -> None:
+        response = _format_string_output(_Text("plain"))
+
+        assert orjson.loads(response.body) == {"response": "plain"}
+
+    @pytest.mark.parametrize(
+        ("output", "expected"),
+        [
+            ({1: "a"}, '{"1":"a"}'),
+            ({"count": 2**70}, '{"count":1180591620717411303424}'),
+        ],
+    )
+    def test_string_output_falls_back_for_values_orjson_rejects(
+        self, output: dict, expected: str
+    ) -> None:
+        response = _format_string_output(output)
+
+        assert orjson.loads(response.body) == {"response": expected}
+
+    async def test_chat_string_falls_back_for_values_orjson_rejects(
+        self, mock_agent: FakeAgent
+    ) -> None:
+        async def keyed_arun(input_data: str, session_id: str = "default") -> dict:
+            return {1: input_data}
+
+        mock_agent.arun = keyed_arun
+
+        response = await _chat_string(mock_agent, b"Hi", "text/plain", "default")
 
-        assert response.status_code == 400
+        assert response == '{"1":"Hi"}'
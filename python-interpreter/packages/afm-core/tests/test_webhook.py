@@ -19,18 +19,26 @@ from __future__ import annotations
 import hashlib
 import hmac
 import json
-from unittest.mock import MagicMock
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
 
+import httpx
+import orjson
 import pytest
+from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
 
-from afm.runner import AgentRunner
 from afm.interfaces.webhook import (
     WebSubSubscriber,
+    _handle_webhook,
+    _read_signed_body,
     create_webhook_app,
+    create_webhook_router,
     verify_webhook_signature,
 )
 from afm.models import (
+    AFMRecord,
+    AgentMetadata,
     Exposure,
     HTTPExposure,
     JSONSchema,
@@ -38,21 +46,25 @@ from afm.models import (
     Subscription,
     WebhookInterface,
 )
+from afm.templates import compile_template
+from fake_agent import FakeAgent
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+
+_PROMPT = "Received event: ${http:payload.event} from ${http:header.User-Agent}"
 
-@pytest.fixture
-def mock_webhook_agent() -> MagicMock:
-    agent = MagicMock(spec=AgentRunner)
-    agent.name = "Webhook Test Agent"
-    agent.description = "A test agent for webhook testing"
-    agent.afm = MagicMock()
-    agent.afm.metadata = MagicMock()
-    agent.afm.metadata.version = "1.0.0"
 
+async def _processing_arun(input_data: str, session_id: str = "default") -> str:
+    return f"Processed: {input_data[:50]}..."
+
+
+def _make_webhook_agent() -> FakeAgent:
     # Configure webhook interface
     interface = WebhookInterface(
         type="webhook",
-        prompt="Received event: ${http:payload.event} from ${http:header.User-Agent}",
+        prompt=_PROMPT,
         signature=Signature(
             input=JSONSchema(type="object"),
             output=JSONSchema(type="string"),
@@ -65,25 +77,71 @@ def mock_webhook_agent() -> MagicMock:
         ),
         exposure=Exposure(http=HTTPExposure(path="/webhook")),
     )
-    agent.afm.metadata.interfaces = [interface]
+    return FakeAgent(
+        name="Webhook Test Agent",
+        description="A test agent for webhook testing",
+        afm=AFMRecord(
+            metadata=AgentMetadata(version="1.0.0", interfaces=[interface]),
+            role="",
+            instructions="",
+        ),
+        arun=_processing_arun,
+    )
 
-    # Mock async run
-    async def mock_arun(input_data: str, session_id: str = "default") -> str:
-        return f"Processed: {input_data[:50]}..."
 
-    agent.arun = mock_arun
-    return agent
+@pytest.fixture
+def mock_webhook_agent() -> FakeAgent:
+    return _make_webhook_agent()
+
+
+@pytest.fixture(scope="module")
+def shared_webhook_agent() -> FakeAgent:
+    return _make_webhook_agent()
+
+
+@pytest.fixture(scope="module")
+def shared_unsigned_client(shared_webhook_agent: FakeAgent) -> TestClient:
+    app = create_webhook_app(
+        shared_webhook_agent,
+        auto_subscribe=False,
+        verify_signatures=False,
+    )
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def shared_signed_client(shared_webhook_agent: FakeAgent) -> TestClient:
+    app = create_webhook_app(
+        shared_webhook_agent,
+        auto_subscribe=False,
+        verify_signatures=True,
+    )
+    return TestClient(app)
+
+
+@pytest.fixture
+def webhook_agent(shared_webhook_agent: FakeAgent) -> FakeAgent:
+    # The apps are built once per module, so undo any per-test override
+    shared_webhook_agent.arun = _processing_arun
+    return shared_webhook_agent
+
+
+@pytest.fixture
+def unsigned_client(
+    webhook_agent: FakeAgent, shared_unsigned_client: TestClient
+) -> TestClient:
+    return shared_unsigned_client
 
 
 @pytest.fixture
-def mock_webhook_agent_no_template() -> MagicMock:
-    agent = MagicMock(spec=AgentRunner)
-    agent.name = "No Template Agent"
-    agent.description = "Agent without prompt template"
-    agent.afm = MagicMock()
-    agent.afm.metadata = MagicMock()
-    agent.afm.metadata.version = "1.0.0"
+def signed_client(
+    webhook_agent: FakeAgent, shared_signed_client: TestClient
+) -> TestClient:
+    return shared_signed_client
 
+
+@pytest.fixture
+def mock_webhook_agent_no_template() -> FakeAgent:
     # Configure webhook interface without prompt
     interface = WebhookInterface(
         type="webhook",
@@ -97,24 +155,24 @@ def mock_webhook_agent_no_template() -> MagicMock:
         ),
         exposure=Exposure(http=HTTPExposure(path="/webhook")),
     )
-    agent.afm.metadata.interfaces = [interface]
 
     async def mock_arun(input_data: str, session_id: str = "default") -> str:
         return f"Raw payload: {input_data[:30]}..."
 
-    agent.arun = mock_arun
-    return agent
+    return FakeAgent(
+        name="No Template Agent",
+        description="Agent without prompt template",
+        afm=AFMRecord(
+            metadata=AgentMetadata(version="1.0.0", interfaces=[interface]),
+            role="",
+            instructions="",
+        ),
+        arun=mock_arun,
+    )
 
 
 @pytest.fixture
-def mock_webhook_agent_no_secret() -> MagicMock:
-    agent = MagicMock(spec=AgentRunner)
-    agent.name = "No Secret Agent"
-    agent.description = "Agent without webhook secret"
-    agent.afm = MagicMock()
-    agent.afm.metadata = MagicMock()
-    agent.afm.metadata.version = "1.0.0"
-
+def mock_webhook_agent_no_secret() -> FakeAgent:
     interface = WebhookInterface(
         type="webhook",
         prompt="Event: ${http:payload.type}",
@@ -128,13 +186,27 @@ def mock_webhook_agent_no_secret() -> MagicMock:
         ),
         exposure=Exposure(http=HTTPExposure(path="/webhook")),
     )
-    agent.afm.metadata.interfaces = [interface]
 
     async def mock_arun(input_data: str, session_id: str = "default") -> str:
         return f"Processed: {input_data}"
 
-    agent.arun = mock_arun
-    return agent
+    return FakeAgent(
+        name="No Secret Agent",
+        description="Agent without webhook secret",
+        afm=AFMRecord(
+            metadata=AgentMetadata(version="1.0.0", interfaces=[interface]),
+            role="",
+            instructions="",
+        ),
+        arun=mock_arun,
+    )
+
+
+def _signed(payload: dict, secret: str = "test-secret-123") -> tuple[bytes, str]:
+    # Signed once at collection time rather than in each test run
+    body = json.dumps(payload).encode()
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return body, f"sha256={digest}"
 
 
 class TestVerifyWebhookSignature:
@@ -202,32 +274,52 @@ class TestVerifyWebhookSignature:
 
         assert result is True
 
+    def test_uppercase_hex_signature(self) -> None:
+        body = b'{"event": "test"}'
+        secret = "my-secret"
+        expected_sig = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+        result = verify_webhook_signature(
+            body=body,
+            signature_header=f"sha256={expected_sig.upper()}",
+            secret=secret,
+        )
+
+        assert result is True
+
+    def test_repeated_verification_with_same_secret(self) -> None:
+        secret = "my-secret"
+        for body in (b'{"event": "a"}', b'{"event": "b"}'):
+            expected_sig = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+            assert verify_webhook_signature(body, f"sha256={expected_sig}", secret)
+
+    @pytest.mark.parametrize("signature", ["z" * 64, "\u00e9" * 64, "ab " * 21 + "a"])
+    def test_malformed_hex_signature(self, signature: str) -> None:
+        result = verify_webhook_signature(
+            body=b'{"event": "test"}',
+            signature_header=f"sha256={signature}",
+            secret="my-secret",
+        )
+
+        assert result is False
+
 
 class TestCreateWebhookApp:
-    def test_creates_fastapi_app(self, mock_webhook_agent: MagicMock) -> None:
-        app = create_webhook_app(mock_webhook_agent, auto_subscribe=False)
+    def test_creates_fastapi_app(self, signed_client: TestClient) -> None:
+        # The shared signed app uses create_webhook_app's defaults
+        app = signed_client.app
 
-        assert app is not None
+        assert isinstance(app, FastAPI)
         assert "Webhook" in app.title
 
-    def test_health_endpoint(self, mock_webhook_agent: MagicMock) -> None:
-        app = create_webhook_app(mock_webhook_agent, auto_subscribe=False)
-        client = TestClient(app)
-
-        response = client.get("/health")
+    def test_health_endpoint(self, signed_client: TestClient) -> None:
+        response = signed_client.get("/health")
 
         assert response.status_code == 200
         assert response.json()["status"] == "ok"
 
-    def test_webhook_processes_payload(self, mock_webhook_agent: MagicMock) -> None:
-        app = create_webhook_app(
-            mock_webhook_agent,
-            auto_subscribe=False,
-            verify_signatures=False,
-        )
-        client = TestClient(app)
-
-        response = client.post(
+    def test_webhook_processes_payload(self, unsigned_client: TestClient) -> None:
+        response = unsigned_client.post(
             "/webhook",
             json={"event": "test_event", "data": "test_data"},
             headers={"User-Agent": "TestClient/1.0"},
@@ -239,44 +331,25 @@ class TestCreateWebhookApp:
         # The template should have substituted the values
         assert "Processed:" in data["result"]
 
-    def test_webhook_with_signature_verification(
-        self, mock_webhook_agent: MagicMock
-    ) -> None:
-        app = create_webhook_app(
-            mock_webhook_agent,
-            auto_subscribe=False,
-            verify_signatures=True,
-        )
-        client = TestClient(app)
+    def test_webhook_accepts_valid_signature(self, signed_client: TestClient) -> None:
+        # Goes through the real request stream that the signed body is read from
+        body, signature = _signed({"event": "test_event", "data": "test_data"})
 
-        payload = {"event": "test_event"}
-        body = json.dumps(payload).encode()
-        secret = "test-secret-123"
-        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
-
-        response = client.post(
+        response = signed_client.post(
             "/webhook",
             content=body,
             headers={
                 "Content-Type": "application/json",
-                "X-Hub-Signature-256": f"sha256={signature}",
+                "X-Hub-Signature-256": signature,
                 "User-Agent": "TestClient/1.0",
             },
         )
 
         assert response.status_code == 200
+        assert "Processed:" in response.json()["result"]
 
-    def test_webhook_rejects_invalid_signature(
-        self, mock_webhook_agent: MagicMock
-    ) -> None:
-        app = create_webhook_app(
-            mock_webhook_agent,
-            auto_subscribe=False,
-            verify_signatures=True,
-        )
-        client = TestClient(app)
-
-        response = client.post(
+    def test_webhook_rejects_invalid_signature(self, signed_client: TestClient) -> None:
+        response = signed_client.post(
             "/webhook",
             json={"event": "test_event"},
             headers={"X-Hub-Signature-256": "sha256=invalid"},
@@ -285,72 +358,197 @@ class TestCreateWebhookApp:
         assert response.status_code == 401
         assert "Invalid signature" in response.json()["detail"]
 
-    def test_webhook_without_template_uses_raw_payload(
-        self, mock_webhook_agent_no_template: MagicMock
-    ) -> None:
-        app = create_webhook_app(
-            mock_webhook_agent_no_template,
-            auto_subscribe=False,
-            verify_signatures=False,
+    def test_router_mounted_in_custom_app(self, mock_webhook_agent: FakeAgent) -> None:
+        interface = mock_webhook_agent.afm.metadata.interfaces[0]
+        app = FastAPI()
+        app.include_router(
+            create_webhook_router(
+                mock_webhook_agent, interface, "/events", verify_signatures=False
+            ),
+            prefix="/hooks",
         )
-        client = TestClient(app)
 
-        response = client.post(
-            "/webhook",
-            json={"type": "notification", "message": "Hello"},
+        response = TestClient(app).post(
+            "/hooks/events",
+            json={"event": "test_event"},
+            headers={"User-Agent": "TestClient/1.0"},
         )
 
         assert response.status_code == 200
-        data = response.json()
-        assert "Raw payload:" in data["result"]
+        assert "Processed:" in response.json()["result"]
+
+
+class _StreamedRequest:
+    """Just enough of a Request for _read_signed_body."""
+
+    def __init__(self, body: bytes, headers: dict[str, str]) -> None:
+        self.headers = headers
+        self.chunks = [body[:7], body[7:]]
+        self.streamed = False
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        self.streamed = True
+        for chunk in self.chunks:
+            yield chunk
+
+
+class TestReadSignedBody:
+    @pytest.mark.parametrize(
+        ("body", "signature"),
+        [
+            _signed({"event": "test_event"}),
+            _signed({"event": "push", "data": {"ref": "main"}}),
+            _signed({"event": "ping", "items": [1, 2, 3]}),
+        ],
+    )
+    async def test_valid_signature_accepted(self, body: bytes, signature: str) -> None:
+        request = _StreamedRequest(body, {"X-Hub-Signature-256": signature})
+
+        result = await _read_signed_body(request, "test-secret-123")
+
+        assert result == body
+
+    async def test_tampered_body_rejected(self) -> None:
+        body, signature = _signed({"event": "test_event"})
+        request = _StreamedRequest(body + b" ", {"X-Hub-Signature-256": signature})
 
-    def test_webhook_invalid_json_returns_400(
-        self, mock_webhook_agent: MagicMock
+        with pytest.raises(HTTPException) as exc_info:
+            await _read_signed_body(request, "test-secret-123")
+
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.parametrize("headers", [{}, {"X-Hub-Signature-256": "sha256=bad"}])
+    async def test_unusable_signature_rejected_unread(
+        self, headers: dict[str, str]
     ) -> None:
-        app = create_webhook_app(
+        request = _StreamedRequest(b'{"event": "test"}', headers)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await _read_signed_body(request, "test-secret-123")
+
+        assert exc_info.value.status_code == 401
+        assert not request.streamed
+
+
+class TestHandleWebhook:
+    async def test_template_prompt_returns_result(
+        self, mock_webhook_agent: FakeAgent
+    ) -> None:
+        response = await _handle_webhook(
             mock_webhook_agent,
-            auto_subscribe=False,
-            verify_signatures=False,
+            bytearray(b'{"event": "test_event"}'),
+            {"User-Agent": "TestClient/1.0"},
+            compile_template(_PROMPT),
+            True,
         )
-        client = TestClient(app)
 
-        response = client.post(
-            "/webhook",
-            content=b"not json",
-            headers={"Content-Type": "application/json"},
+        assert response.status_code == 200
+        assert "Processed:" in orjson.loads(response.body)["result"]
+
+    async def test_without_template_uses_raw_payload(
+        self, mock_webhook_agent_no_template: FakeAgent
+    ) -> None:
+        response = await _handle_webhook(
+            mock_webhook_agent_no_template,
+            b'{"type": "notification", "message": "Hello"}',
+            {},
+            None,
+            True,
         )
 
-        assert response.status_code == 400
-        assert "Invalid JSON" in response.json()["detail"]
+        assert response.status_code == 200
+        assert "Raw payload:" in orjson.loads(response.body)["result"]
 
-    def test_webhook_agent_error_returns_500(
-        self, mock_webhook_agent: MagicMock
+    async def test_without_template_prompt_is_indented_json(
+        self, mock_webhook_agent_no_template: FakeAgent
     ) -> None:
+        prompts: list[str] = []
 
-        async def failing_arun(input_data: str, session_id: str = "default") -> str:
-            raise Exception("Agent failed")
+        async def capture_arun(input_data: str, session_id: str = "default") -> str:
+            prompts.append(input_data)
+            return "ok"
 
-        mock_webhook_agent.arun = failing_arun
+        mock_webhook_agent_no_template.arun = capture_arun
 
-        app = create_webhook_app(
-            mock_webhook_agent,
-            auto_subscribe=False,
-            verify_signatures=False,
+        await _handle_webhook(
+            mock_webhook_agent_no_template,
+            '{"message": "café", "ids": [1]}'.encode(),
+            {},
+            None,
+            True,
         )
-        client = TestClient(app)
 
-        response = client.post(
-            "/webhook",
-            json={"event": "test"},
+        assert prompts == ['{\n  "message": "café",\n  "ids": [\n    1\n  ]\n}']
+
+    async def test_invalid_json_returns_400(
+        self, mock_webhook_agent: FakeAgent
+    ) -> None:
+        with pytest.raises(HTTPException) as exc_info:
+            await _handle_webhook(
+                mock_webhook_agent,
+                b"not json",
+                {},
+                compile_template(_PROMPT),
+                True,
+            )
+
+        assert exc_info.value.status_code == 400
+        assert "Invalid JSON" in exc_info.value.detail
+
+    @pytest.mark.parametrize(
+        ("agent_output", "expected_body"),
+        [
+            ('{"count": 123456789012345678901234567890}', None),
+            ("[1, 2]", None),
+            ("not json", b'{"result":"not json"}'),
+        ],
+    )
+    async def test_object_output_from_string(
+        self,
+        mock_webhook_agent: FakeAgent,
+        agent_output: str,
+        expected_body: bytes | None,
+    ) -> None:
+        async def string_arun(input_data: str, session_id: str = "default") -> str:
+            return agent_output
+
+        mock_webhook_agent.arun = string_arun
+
+        response = await _handle_webhook(
+            mock_webhook_agent,
+            b'{"event": "test"}',
+            {"User-Agent": "TestClient/1.0"},
+            compile_template(_PROMPT),
+            False,
         )
 
-        assert response.status_code == 500
-        assert "Internal server error" in response.json()["detail"]
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        # Valid JSON is passed through untouched
+        assert response.body == (expected_body or agent_output.encode())
+
+    async def test_agent_error_returns_500(self, mock_webhook_agent: FakeAgent) -> None:
+        async def failing_arun(input_data: str, session_id: str = "default") -> str:
+            raise Exception("Agent failed")
+
+        mock_webhook_agent.arun = failing_arun
+
+        with pytest.raises(HTTPException) as exc_info:
+            await _handle_webhook(
+                mock_webhook_agent,
+                b'{"event": "test"}',
+                {"User-Agent": "TestClient/1.0"},
+                compile_template(_PROMPT),
+                True,
+            )
+
+        assert exc_info.value.status_code == 500
+        assert "Internal server error" in exc_info.value.detail
 
 
 class TestWebSubVerification:
     def test_websub_verification_returns_challenge(
-        self, mock_webhook_agent: MagicMock
+        self, mock_webhook_agent: FakeAgent
     ) -> None:
         app = create_webhook_app(
             mock_webhook_agent,
@@ -378,7 +576,7 @@ class TestWebSubVerification:
         assert response.text == "test-challenge-abc"
 
     def test_websub_verification_fails_wrong_topic(
-        self, mock_webhook_agent: MagicMock
+        self, mock_webhook_agent: FakeAgent
     ) -> None:
         app = create_webhook_app(
             mock_webhook_agent,
@@ -404,7 +602,7 @@ class TestWebSubVerification:
         assert response.status_code == 404
 
     def test_websub_verification_no_subscriber(
-        self, mock_webhook_agent_no_secret: MagicMock
+        self, mock_webhook_agent_no_secret: FakeAgent
     ) -> None:
         app = create_webhook_app(
             mock_webhook_agent_no_secret,
@@ -425,3 +623,127 @@ class TestWebSubVerification:
         )
 
         assert response.status_code == 404
+
+    def test_websub_verification_without_subscriber_state_echoes(
+        self, mock_webhook_agent_no_secret: FakeAgent
+    ) -> None:
+        app = create_webhook_app(
+            mock_webhook_agent_no_secret,
+            auto_subscribe=False,
+        )
+        del app.state.websub_subscriber
+
+        client = TestClient(app)
+
+        response = client.get(
+            "/webhook",
+            params={
+                "hub.mode": "subscribe",
+                "hub.topic": "https://example.com/topic",
+                "hub.challenge": "test-challenge",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.text == "test-challenge"
+
+
+class _Hub:
+    """Records requests to a mock hub and the clients created to send them."""
+
+    def __init__(self, status_code: int = 202) -> None:
+        self.status_code = status_code
+        self.requests: list[httpx.Request] = []
+        self.clients: list[httpx.AsyncClient] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(self.status_code)
+
+    def client(self, **kwargs: Any) -> httpx.AsyncClient:
+        client = _REAL_ASYNC_CLIENT(
+            transport=httpx.MockTransport(self.handle), **kwargs
+        )
+        self.clients.append(client)
+        return client
+
+
+_REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+
+@pytest.fixture
+def hub() -> Iterator[_Hub]:
+    mock_hub = _Hub()
+    with patch("afm.interfaces.webhook.httpx.AsyncClient", mock_hub.client):
+        yield mock_hub
+
+
+def _subscriber(**kwargs: Any) -> WebSubSubscriber:
+    return WebSubSubscriber(
+        hub="https://hub.example.com",
+        topic=kwargs.pop("topic", "https://example.com/events"),
+        callback="http://localhost/webhook",
+        **kwargs,
+    )
+
+
+class TestWebSubSubscriber:
+    async def test_requests_inside_context_share_a_client(self, hub: _Hub) -> None:
+        subscriber = _subscriber()
+
+        async with subscriber:
+            assert await subscriber.subscribe()
+            assert await subscriber.unsubscribe()
+
+        assert len(hub.clients) == 1
+        assert hub.clients[0].is_closed
+        assert subscriber._client is None
+        forms = [request.content for request in hub.requests]
+        assert [b"hub.mode=subscribe" in form for form in forms] == [True, False]
+
+    async def test_requests_outside_context_use_one_shot_clients(
+        self, hub: _Hub
+    ) -> None:
+        subscriber = _subscriber()
+
+        assert await subscriber.subscribe()
+        assert await subscriber.unsubscribe()
+
+        assert len(hub.clients) == 2
+        assert all(client.is_closed for client in hub.clients)
+        assert subscriber._client is None
+
+    async def test_subscribe_form_matches_httpx_encoding(self, hub: _Hub) -> None:
+        hub.status_code = 500
+        subscriber = _subscriber(
+            topic="https://example.com/events?kind=a b",
+            secret="s3cr=t",
+            lease_seconds=60,
+        )
+
+        async with subscriber:
+            assert not await subscriber.subscribe()
+            assert not await subscriber.subscribe()
+
+        expected = httpx.Request(
+            "POST",
+            "https://hub.example.com",
+            data={
+                "hub.mode": "subscribe",
+                "hub.topic": "https://example.com/events?kind=a b",
+                "hub.callback": "http://localhost/webhook",
+                "hub.lease_seconds": "60",
+                "hub.secret": "s3cr=t",
+            },
+        )
+        assert [request.content for request in hub.requests] == [expected.content] * 2
+        assert (
+            hub.requests[0].headers["Content-Type"] == expected.headers["Content-Type"]
+        )
+
+    async def test_aclose_without_requests_is_noop(self) -> None:
+        subscriber = _subscriber()
+
+        await subscriber.aclose()
+
+        assert subscriber._client is None
@@ -102,15 +102,17 @@ class LangChainRunner:
 
         if self._mcp_manager is not None:
             logger.info(f"Connecting to MCP servers: {self._mcp_manager.server_names}")
-            self._mcp_tools = await self._mcp_manager.get_tools()
+            try:
+                await self._mcp_manager.connect()
+                # Servers whose tools fail to load are retried in the
+                # background; arun() binds their tools once they load
+                self._mcp_tools = await self._mcp_manager.get_tools()
+            except BaseException:
+                await self._mcp_manager.aclose()
+                raise
             logger.info(f"Loaded {len(self._mcp_tools)} MCP tools")
 
-        # Bind tools to model if any are available
-        all_tools = self._get_all_tools()
-        if all_tools:
-            self._model = self._base_model.bind_tools(all_tools)
-            logger.info(f"Bound {len(all_tools)} tools to model")
-
+        self._bind_tools()
         self._connected = True
 
     async def disconnect(self) -> None:
@@ -124,8 +126,31 @@ class LangChainRunner:
 
         if self._mcp_manager is not None:
             self._mcp_manager.clear_cache()
+            await self._mcp_manager.aclose()
             logger.info("Disconnected from MCP servers")
 
+    def _refresh_mcp_tools(self) -> None:
+        if not self._connected or self._mcp_manager is None:
+            return
+
+        # The manager swaps in a new list when a server's tools are added
+        # by a background retry or dropped with a closed session
+        tools = self._mcp_manager.tools
+        if tools is self._mcp_tools:
+            return
+        self._mcp_tools = tools
+        logger.info(f"Now using {len(self._mcp_tools)} MCP tools")
+        self._bind_tools()
+
+    def _bind_tools(self) -> None:
+        # Bind tools to model if any are available
+        all_tools = self._get_all_tools()
+        if all_tools:
+            self._model = self._base_model.bind_tools(all_tools)
+            logger.info(f"Bound {len(all_tools)} tools to model")
+        else:
+            self._model = self._base_model
+
     def _get_all_tools(self) -> list[BaseTool]:
         return self._external_tools + self._mcp_tools + self._skill_tools
 
@@ -160,6 +185,7 @@ class LangChainRunner:
 
     @property
     def tools(self) -> list[BaseTool]:
+        self._refresh_mcp_tools()
         return self._get_all_tools()
 
     @property
@@ -238,6 +264,8 @@ class LangChainRunner:
             # Prepare and validate input
             user_input = self._prepare_input(input_data)
 
+            self._refresh_mcp_tools()
+
             # Get session history
             session_history = self._get_session_history(session_id)
 
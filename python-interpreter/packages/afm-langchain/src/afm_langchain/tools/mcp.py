@@ -16,7 +16,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Callable
+from functools import cached_property, partial
+from typing import TYPE_CHECKING
 
 import httpx
 from afm.exceptions import (
@@ -35,9 +39,62 @@ from afm.models import (
 from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langchain_mcp_adapters.sessions import StdioConnection, StreamableHttpConnection
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp.shared.exceptions import McpError
+
+if TYPE_CHECKING:
+    from mcp import ClientSession
 
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by the HTTP servers of one MCPManager
+_HTTP_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=100,
+    max_connections=200,
+    keepalive_expiry=60.0,
+)
+
+# Delay before retrying a server whose tools failed to load, doubled after
+# each failed attempt up to the maximum
+_RETRY_INITIAL_DELAY = 1.0
+_RETRY_MAX_DELAY = 60.0
+
+# Errors a session can fail with when the server is unreachable or drops
+# the connection. The HTTP transport raises them inside an ExceptionGroup
+_SESSION_ERRORS = (OSError, httpx.HTTPError, McpError)
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Lends a connection pool to short-lived clients without closing it."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # Each MCP session closes its client on exit; the pool stays open
+        # until MCPManager.aclose()
+        pass
+
+
+def _create_pooled_http_client(
+    headers: dict[str, str] | None = None,
+    timeout: httpx.Timeout | None = None,
+    auth: httpx.Auth | None = None,
+    *,
+    transport: httpx.AsyncBaseTransport,
+) -> httpx.AsyncClient:
+    # Same defaults as mcp's create_mcp_http_client
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout if timeout is not None else httpx.Timeout(30.0, read=300.0),
+        auth=auth,
+        follow_redirects=True,
+        transport=transport,
+    )
+
 
 class BearerAuth(httpx.Auth):
     def __init__(self, token: str) -> None:
@@ -97,29 +154,19 @@ def filter_tools(
     if tool_filter is None:
         return tools
 
-    allow = tool_filter.allow
-    deny = tool_filter.deny
-
     # No filters specified
-    if allow is None and deny is None:
+    if tool_filter.allow is None and tool_filter.deny is None:
         return tools
 
-    # Build a set of tool names for efficient lookup
-    tool_names = {tool.name for tool in tools}
+    allowed = tool_filter.allow_set
+    denied = tool_filter.deny_set
 
-    if allow is not None:
-        # Start with allowed tools only
-        allowed_set = set(allow) & tool_names
-    else:
-        # Start with all tools
-        allowed_set = tool_names
-
-    if deny is not None:
-        # Remove denied tools
-        allowed_set -= set(deny)
-
-    # Filter the tools list maintaining order
-    return [tool for tool in tools if tool.name in allowed_set]
+    # Filter the tools list in one pass, maintaining order
+    if allowed is None:
+        return [tool for tool in tools if tool.name not in denied]
+    return [
+        tool for tool in tools if (name := tool.name) in allowed and name not in denied
+    ]
 
 
 class MCPClient:
@@ -134,6 +181,9 @@ class MCPClient:
         self.transport = transport
         self.tool_filter = tool_filter
         self._tools: list[BaseTool] | None = None
+        self._session: ClientSession | None = None
+        self._session_task: asyncio.Task[None] | None = None
+        self._close_session: asyncio.Event | None = None
 
     @classmethod
     def from_mcp_server(cls, server: MCPServer) -> "MCPClient":
@@ -151,7 +201,9 @@ class MCPClient:
             tool_filter=server.tool_filter,
         )
 
-    def _build_connection_config(self) -> StreamableHttpConnection | StdioConnection:
+    @cached_property
+    def _connection_config(self) -> StreamableHttpConnection | StdioConnection:
+        # Built once per client; the auth object is reused by every session
         if isinstance(self.transport, HttpTransport):
             config: StreamableHttpConnection = {
                 "transport": "streamable_http",
@@ -172,20 +224,132 @@ class MCPClient:
                 config["env"] = self.transport.env
             return config
 
-    async def get_tools(self) -> list[BaseTool]:
-        try:
-            # Create a client for just this server
+    def _build_connection_config(
+        self, http_pool: httpx.AsyncBaseTransport | None = None
+    ) -> StreamableHttpConnection | StdioConnection:
+        config = self._connection_config
+        if http_pool is not None and isinstance(self.transport, HttpTransport):
+            return {
+                **config,
+                "httpx_client_factory": partial(
+                    _create_pooled_http_client, transport=http_pool
+                ),
+            }
+        return config
+
+    async def connect(
+        self,
+        client: MultiServerMCPClient | None = None,
+        on_close: Callable[[], None] | None = None,
+    ) -> None:
+        """Open a session to the server and keep it until aclose().
+
+        on_close is called if an open session ends, including when the
+        server drops it; connect() can then be called again to reopen it.
+        """
+        if self._session_task is not None:
+            return
+        if client is None:
             client = MultiServerMCPClient({self.name: self._build_connection_config()})
 
-            # Get tools from the server
-            tools = await client.get_tools(server_name=self.name)
+        # The session lives in its own task because the MCP transports use
+        # anyio cancel scopes, which must be exited by the task entering them
+        ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._close_session = asyncio.Event()
+        task = self._session_task = asyncio.create_task(
+            self._hold_session(client, ready, self._close_session, on_close)
+        )
+        opened = False
+        try:
+            await ready
+            opened = True
+        except (*_SESSION_ERRORS, ExceptionGroup) as e:
+            raise MCPConnectionError(
+                f"Failed to connect: {e}",
+                server_name=self.name,
+            ) from e
+        except asyncio.CancelledError:
+            # ready is also cancelled when the session task fails with an
+            # error that is not a transport error; report that error instead
+            if task.done() and not task.cancelled():
+                error = task.exception()
+                if error is not None:
+                    raise error from None
+            raise
+        finally:
+            if not opened:
+                # Don't leave the session task behind a failed or cancelled
+                # connect; it exits its transport scopes before we return
+                task.cancel()
+                await asyncio.wait({task})
+
+    async def _hold_session(
+        self,
+        client: MultiServerMCPClient,
+        ready: asyncio.Future[None],
+        close: asyncio.Event,
+        on_close: Callable[[], None] | None,
+    ) -> None:
+        opened = False
+        try:
+            async with client.session(self.name) as session:
+                self._session = session
+                ready.set_result(None)
+                opened = True
+                await close.wait()
+        except* _SESSION_ERRORS as group:
+            error = group.exceptions[0] if len(group.exceptions) == 1 else group
+            if not ready.done():
+                ready.set_exception(error)
+            else:
+                logger.warning("MCP server '%s' session closed: %s", self.name, error)
+        finally:
+            self._session = None
+            if self._session_task is asyncio.current_task():
+                self._session_task = None
+            if not ready.done():
+                # Cancelled, or failed with an unexpected error, before the
+                # session opened
+                ready.cancel()
+            elif opened and on_close is not None:
+                # Tools loaded from this session can no longer be called
+                on_close()
+
+    async def aclose(self) -> None:
+        """Close the session opened by connect(), if any."""
+        task = self._session_task
+        if task is None:
+            return
+        self._session_task = None
+        if self._close_session is not None:
+            self._close_session.set()
+        await task
+
+    async def get_tools(
+        self, client: MultiServerMCPClient | None = None
+    ) -> list[BaseTool]:
+        try:
+            if self._session is not None:
+                # Tools loaded from the open session keep using it for calls
+                tools = await load_mcp_tools(self._session, server_name=self.name)
+            else:
+                if client is None:
+                    # Create a client for just this server
+                    client = MultiServerMCPClient(
+                        {self.name: self._build_connection_config()}
+                    )
+
+                # Get tools from the server, opening a session per call
+                tools = await client.get_tools(server_name=self.name)
 
             # Apply filtering
             filtered_tools = filter_tools(tools, self.tool_filter)
 
             logger.info(
-                f"MCP server '{self.name}': loaded {len(filtered_tools)} tools "
-                f"(filtered from {len(tools)})"
+                "MCP server '%s': loaded %d tools (filtered from %d)",
+                self.name,
+                len(filtered_tools),
+                len(tools),
             )
 
             return filtered_tools
@@ -206,6 +370,13 @@ class MCPManager:
         self._servers = servers
         self._clients: list[MCPClient] = []
         self._tools: list[BaseTool] | None = None
+        self._client_tools: dict[MCPClient, list[BaseTool]] = {}
+        self._failed: set[MCPClient] = set()
+        self._retry_task: asyncio.Task[None] | None = None
+        self._mcp_client: MultiServerMCPClient | None = None
+        self._http_pool: httpx.AsyncHTTPTransport | None = None
+        self._pending: asyncio.Task[list[BaseTool]] | None = None
+        self._connected = False
 
         # Create clients for each server
         for server in servers:
@@ -213,7 +384,7 @@ class MCPManager:
                 client = MCPClient.from_mcp_server(server)
                 self._clients.append(client)
             except MCPError as e:
-                logger.warning(f"Skipping MCP server: {e}")
+                logger.warning("Skipping MCP server: %s", e)
 
     @classmethod
     def from_afm(cls, afm: AFMRecord) -> "MCPManager | None":
@@ -231,33 +402,196 @@ class MCPManager:
     def server_names(self) -> list[str]:
         return [client.name for client in self._clients]
 
+    @property
+    def tools(self) -> list[BaseTool]:
+        # The tools loaded so far. A server that comes back after a failure
+        # replaces this with a new list rather than changing it in place
+        return self._tools if self._tools is not None else []
+
+    def _get_mcp_client(self) -> MultiServerMCPClient:
+        # One client holds every server's connection config, built on
+        # first use and kept until aclose(). HTTP servers draw their
+        # connections from one pool so keep-alive connections are reused
+        if self._mcp_client is None:
+            self._http_pool = httpx.AsyncHTTPTransport(limits=_HTTP_POOL_LIMITS)
+            shared_pool = _SharedTransport(self._http_pool)
+            self._mcp_client = MultiServerMCPClient(
+                {
+                    client.name: client._build_connection_config(shared_pool)
+                    for client in self._clients
+                }
+            )
+        return self._mcp_client
+
+    async def connect(self) -> None:
+        """Open a long-lived session to every server.
+
+        Servers that cannot be reached are logged and skipped; get_tools
+        falls back to a session per call for them and reports the failure.
+        A session that ends drops that server's tools until a background
+        retry reopens it. Raises MCPConnectionError if no server can be
+        reached.
+        """
+        self._connected = True
+        errors: list[str] = []
+        mcp_client = self._get_mcp_client()
+        results = await asyncio.gather(
+            *(
+                client.connect(mcp_client, partial(self._session_closed, client))
+                for client in self._clients
+            ),
+            return_exceptions=True,
+        )
+        for client, result in zip(self._clients, results):
+            if isinstance(result, MCPConnectionError):
+                errors.append(str(result))
+                logger.warning(
+                    "Could not open session to '%s': %s", client.name, result
+                )
+            elif isinstance(result, BaseException):
+                raise result
+
+        if errors and len(errors) == len(self._clients):
+            raise MCPConnectionError(
+                f"Failed to connect to any MCP server: {'; '.join(errors)}"
+            )
+
+    async def aclose(self) -> None:
+        """Close the sessions opened by connect() and the HTTP pool."""
+        self._connected = False
+        retry_task = self._retry_task
+        if retry_task is not None:
+            self._retry_task = None
+            retry_task.cancel()
+            await asyncio.wait({retry_task})
+        await asyncio.gather(*(client.aclose() for client in self._clients))
+        if self._http_pool is not None:
+            await self._http_pool.aclose()
+            self._http_pool = None
+            self._mcp_client = None
+
     async def get_tools(self) -> list[BaseTool]:
+        """Load the tools of every server once and cache them.
+
+        Servers that fail are left out of the result, which is cached all
+        the same, and retried in the background with a backoff; the tools
+        property picks them up when they load. Raises MCPConnectionError if
+        no server's tools could be loaded.
+        """
         if self._tools is not None:
             return self._tools
 
-        all_tools: list[BaseTool] = []
-        errors: list[str] = []
+        # Concurrent callers share one in-flight fetch; shielding keeps a
+        # cancelled caller from cancelling it for the others
+        pending = self._pending
+        if pending is None:
+            pending = self._pending = asyncio.create_task(self._fetch_tools())
+            pending.add_done_callback(self._clear_pending)
+        return await asyncio.shield(pending)
 
-        # Get tools from each client individually to handle per-server filtering
-        for client in self._clients:
-            try:
-                tools = await client.get_tools()
-                all_tools.extend(tools)
-            except MCPConnectionError as e:
-                errors.append(str(e))
-                logger.error(f"Failed to get tools from server '{client.name}': {e}")
+    def _clear_pending(self, task: asyncio.Task[list[BaseTool]]) -> None:
+        if self._pending is task:
+            self._pending = None
 
-        if errors and not all_tools:
+    async def _fetch_tools(self) -> list[BaseTool]:
+        errors: list[str] = []
+        failed: set[MCPClient] = set()
+        mcp_client = self._get_mcp_client()
+
+        # Get tools from each client individually to handle per-server
+        # filtering, querying all servers concurrently
+        results = await asyncio.gather(
+            *(client.get_tools(mcp_client) for client in self._clients),
+            return_exceptions=True,
+        )
+        for client, result in zip(self._clients, results):
+            if isinstance(result, MCPConnectionError):
+                errors.append(str(result))
+                failed.add(client)
+                logger.error(
+                    "Failed to get tools from server '%s': %s", client.name, result
+                )
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                self._client_tools[client] = result
+
+        if errors and not self._client_tools:
             raise MCPConnectionError(
                 f"Failed to connect to any MCP server: {'; '.join(errors)}"
             )
 
-        # Only cache if all servers succeeded; partial results are not
-        # cached so that failed servers can be retried on the next call.
-        if not errors:
-            self._tools = all_tools
+        tools = self._update_tools()
+        if failed:
+            self._failed |= failed
+            self._schedule_retry()
+        return tools
+
+    def _update_tools(self) -> list[BaseTool]:
+        # Rebuilt as a new list so holders of the old one can tell it changed
+        self._tools = [
+            tool
+            for client in self._clients
+            for tool in self._client_tools.get(client, ())
+        ]
+        return self._tools
+
+    def _schedule_retry(self) -> None:
+        if self._retry_task is None or self._retry_task.done():
+            self._retry_task = asyncio.create_task(self._retry_failed())
+
+    async def _retry_failed(self) -> None:
+        delay = _RETRY_INITIAL_DELAY
+        while self._failed:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RETRY_MAX_DELAY)
+
+            mcp_client = self._get_mcp_client()
+            clients = [client for client in self._clients if client in self._failed]
+            results = await asyncio.gather(
+                *(self._reload_client(client, mcp_client) for client in clients),
+                return_exceptions=True,
+            )
+            for client, result in zip(clients, results):
+                if isinstance(result, MCPConnectionError):
+                    logger.warning(
+                        "MCP server '%s' is still unavailable: %s", client.name, result
+                    )
+                elif isinstance(result, BaseException):
+                    # Not a connection problem, so retrying will not help
+                    self._failed.discard(client)
+                    logger.error(
+                        "Giving up on MCP server '%s': %s", client.name, result
+                    )
+
+    async def _reload_client(
+        self, client: MCPClient, mcp_client: MultiServerMCPClient
+    ) -> None:
+        if self._connected:
+            try:
+                await client.connect(mcp_client, partial(self._session_closed, client))
+            except MCPConnectionError:
+                # get_tools falls back to a session per call
+                pass
 
-        return all_tools
+        tools = await client.get_tools(mcp_client)
+        self._client_tools[client] = tools
+        self._failed.discard(client)
+        self._update_tools()
+        logger.info("MCP server '%s' is available again", client.name)
 
     def clear_cache(self) -> None:
         self._tools = None
+        self._client_tools.clear()
+        self._failed.clear()
+
+    def _session_closed(self, client: MCPClient) -> None:
+        # Tools loaded from the closed session can no longer be called.
+        # Sessions closed by aclose(), or before tools were loaded, need
+        # nothing further
+        if not self._connected or self._tools is None:
+            return
+        self._client_tools.pop(client, None)
+        self._failed.add(client)
+        self._update_tools()
+        self._schedule_retry()
@@ -19,31 +19,31 @@ from pathlib import Path
 import pytest
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def fixtures_dir() -> Path:
     return Path(__file__).parent / "fixtures"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_agent_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_agent.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_consolechat_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_consolechat_agent.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_webhook_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_webhook_agent.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_minimal_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_minimal.afm.md"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_no_frontmatter_path(fixtures_dir: Path) -> Path:
     return fixtures_dir / "sample_no_frontmatter.afm.md"
@@ -14,15 +14,19 @@
 # specific language governing permissions and limitations
 # under the License.
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from afm_langchain.backend import LangChainRunner
+from afm.exceptions import MCPConnectionError
 from afm.models import (
     AFMRecord,
     AgentMetadata,
+    HttpTransport,
+    MCPServer,
     Model,
+    Tools,
 )
 
 
@@ -149,3 +153,144 @@ class TestModelProviderIntegration:
         with patch("afm_langchain.backend.create_model_provider") as mock_create:
             LangChainRunner(simple_afm, model=mock_chat_model)
             mock_create.assert_not_called()
+
+
+class TestMCPToolLoading:
+    @pytest.fixture
+    def mcp_afm(self) -> AFMRecord:
+        server = MCPServer(
+            name="server1",
+            transport=HttpTransport(type="http", url="http://localhost:8080/mcp"),
+        )
+        return AFMRecord(
+            metadata=AgentMetadata(tools=Tools(mcp=[server])),
+            role="Test",
+            instructions="Test",
+        )
+
+    @pytest.mark.asyncio
+    async def test_tools_are_loaded_on_connect(
+        self,
+        mcp_afm: AFMRecord,
+        mock_chat_model: MagicMock,
+    ) -> None:
+        agent = LangChainRunner(mcp_afm, model=mock_chat_model)
+        assert agent._mcp_manager is not None
+        client = agent._mcp_manager._clients[0]
+        mock_chat_model.bind_tools.return_value = mock_chat_model
+        tool = MagicMock(name="tool1")
+
+        with (
+            patch.object(client, "connect") as mock_connect,
+            patch.object(client, "get_tools", return_value=[tool]) as mock_get_tools,
+        ):
+            await agent.connect()
+            mock_connect.assert_awaited_once()
+            mock_get_tools.assert_awaited_once()
+            assert agent.tools == [tool]
+
+            await agent.arun("Hello")
+            await agent.arun("Again")
+
+            mock_get_tools.assert_awaited_once()
+            mock_chat_model.bind_tools.assert_called_once_with([tool])
+
+            await agent.disconnect()
+            assert agent.tools == []
+
+    @pytest.mark.asyncio
+    async def test_connect_fails_if_no_tools_load(
+        self,
+        mcp_afm: AFMRecord,
+        mock_chat_model: MagicMock,
+    ) -> None:
+        agent = LangChainRunner(mcp_afm, model=mock_chat_model)
+        assert agent._mcp_manager is not None
+        client = agent._mcp_manager._clients[0]
+
+        with (
+            patch.object(client, "connect"),
+            patch.object(
+                client,
+                "get_tools",
+                side_effect=MCPConnectionError("Refused", server_name="server1"),
+            ),
+            pytest.raises(MCPConnectionError),
+        ):
+            await agent.connect()
+
+        assert not agent._connected
+
+    @pytest.mark.asyncio
+    async def test_tools_of_a_recovered_server_are_bound(
+        self,
+        mock_chat_model: MagicMock,
+    ) -> None:
+        servers = [
+            MCPServer(
+                name=name,
+                transport=HttpTransport(type="http", url=f"http://{name}:8080/mcp"),
+            )
+            for name in ("server1", "server2")
+        ]
+        afm = AFMRecord(
+            metadata=AgentMetadata(tools=Tools(mcp=servers)),
+            role="Test",
+            instructions="Test",
+        )
+        agent = LangChainRunner(afm, model=mock_chat_model)
+        manager = agent._mcp_manager
+        assert manager is not None
+        mock_chat_model.bind_tools.return_value = mock_chat_model
+        tool1 = MagicMock(name="tool1")
+        tool2 = MagicMock(name="tool2")
+        get_tools2 = AsyncMock(
+            side_effect=[MCPConnectionError("Refused", server_name="server2"), [tool2]]
+        )
+
+        with (
+            patch("afm_langchain.tools.mcp._RETRY_INITIAL_DELAY", 0),
+            patch.object(manager._clients[0], "connect"),
+            patch.object(manager._clients[1], "connect"),
+            patch.object(
+                manager._clients[0], "get_tools", return_value=[tool1]
+            ) as get_tools1,
+            patch.object(manager._clients[1], "get_tools", get_tools2),
+        ):
+            await agent.connect()
+            assert agent.tools == [tool1]
+            # The request runs with the tools that did load
+            assert await agent.arun("Hello") == "Hello! I'm here to help."
+
+            assert manager._retry_task is not None
+            await manager._retry_task
+            await agent.arun("Again")
+
+            assert agent.tools == [tool1, tool2]
+            mock_chat_model.bind_tools.assert_called_with([tool1, tool2])
+            # Only the failed server is asked again
+            get_tools1.assert_awaited_once()
+            await agent.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_connect_fails_when_no_server_is_reachable(
+        self,
+        mcp_afm: AFMRecord,
+        mock_chat_model: MagicMock,
+    ) -> None:
+        agent = LangChainRunner(mcp_afm, model=mock_chat_model)
+        assert agent._mcp_manager is not None
+
+        with (
+            patch.object(
+                agent._mcp_manager,
+                "connect",
+                side_effect=MCPConnectionError("Failed to connect to any MCP server"),
+            ),
+            patch.object(agent._mcp_manager, "aclose") as mock_aclose,
+            pytest.raises(MCPConnectionError),
+        ):
+            await agent.connect()
+
+        mock_aclose.assert_awaited_once()
+        assert not agent._connected
@@ -14,6 +14,8 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import asyncio
+from contextlib import asynccontextmanager
 from typing import cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -22,7 +24,7 @@ import pytest
 from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.sessions import StdioConnection
 
-from afm.exceptions import MCPConnectionError
+from afm.exceptions import MCPAuthenticationError, MCPConnectionError
 from afm.models import (
     AFMRecord,
     AgentMetadata,
@@ -183,6 +185,30 @@ class TestFilterTools:
         assert result[0].name == "tool1"
         assert result[1].name == "tool3"
 
+    def test_empty_allow_returns_no_tools(self):
+        tools = [make_mock_tool("tool1"), make_mock_tool("tool2")]
+        tool_filter = ToolFilter(allow=[], deny=["tool2"])
+        assert filter_tools(tools, tool_filter) == []
+
+    def test_filter_sets_are_cached_on_the_model(self):
+        tool_filter = ToolFilter(allow=["tool1"], deny=["tool2"])
+        assert tool_filter.allow_set == frozenset({"tool1"})
+        assert tool_filter.allow_set is tool_filter.allow_set
+        assert tool_filter.deny_set is tool_filter.deny_set
+        assert tool_filter.model_dump() == {"allow": ["tool1"], "deny": ["tool2"]}
+        assert tool_filter == ToolFilter(allow=["tool1"], deny=["tool2"])
+
+    def test_filter_sets_follow_reassignment(self):
+        tools = [make_mock_tool("tool1"), make_mock_tool("tool2")]
+        tool_filter = ToolFilter(allow=["tool1"])
+        assert filter_tools(tools, tool_filter) == [tools[0]]
+
+        tool_filter.allow = ["tool2"]
+        tool_filter.deny = ["tool1"]
+        assert tool_filter.allow_set == frozenset({"tool2"})
+        assert tool_filter.deny_set == frozenset({"tool1"})
+        assert filter_tools(tools, tool_filter) == [tools[1]]
+
 
 class TestMCPClient:
     def test_from_mcp_server_creates_client(self):
@@ -244,6 +270,22 @@ class TestMCPClient:
         assert "auth" in config
         assert isinstance(config["auth"], BearerAuth)
 
+    def test_build_connection_config_is_built_once(self):
+        server = make_mcp_server(name="test", auth_type="bearer")
+        client = MCPClient.from_mcp_server(server)
+
+        with patch(
+            "afm_langchain.tools.mcp.build_httpx_auth", wraps=build_httpx_auth
+        ) as mock_auth:
+            first = client._build_connection_config()
+            second = client._build_connection_config()
+            pooled = client._build_connection_config(MagicMock())
+
+        mock_auth.assert_called_once()
+        assert first is second
+        assert pooled["auth"] is first["auth"]
+        assert "httpx_client_factory" not in first
+
     def test_build_connection_config_stdio(self):
         server = make_stdio_mcp_server(
             name="stdio-test",
@@ -356,6 +398,171 @@ class TestMCPClient:
             assert result[0].name == "stdio_tool"
             mock_instance.get_tools.assert_called_once_with(server_name="stdio-server")
 
+    @pytest.mark.asyncio
+    async def test_connect_keeps_session_until_aclose(self):
+        client = MCPClient.from_mcp_server(make_mcp_server(name="test-server"))
+        session = object()
+        exited = False
+
+        @asynccontextmanager
+        async def open_session(name):
+            nonlocal exited
+            yield session
+            exited = True
+
+        mcp_client = MagicMock()
+        mcp_client.session = open_session
+
+        with patch(
+            "afm_langchain.tools.mcp.load_mcp_tools",
+            return_value=[make_mock_tool("tool1")],
+        ) as mock_load:
+            await client.connect(mcp_client)
+            await client.get_tools()
+            await client.get_tools()
+            assert not exited
+
+            await client.aclose()
+
+        assert exited
+        assert mock_load.call_count == 2
+        mock_load.assert_called_with(session, server_name="test-server")
+        mcp_client.get_tools.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connect_failure_raises_mcp_error(self):
+        client = MCPClient.from_mcp_server(make_mcp_server(name="test-server"))
+
+        @asynccontextmanager
+        async def open_session(name):
+            raise OSError("Connection refused")
+            yield
+
+        mcp_client = MagicMock()
+        mcp_client.session = open_session
+
+        with pytest.raises(MCPConnectionError, match="Failed to connect"):
+            await client.connect(mcp_client)
+
+        # Without a session, get_tools falls back to a session per call
+        mcp_client.get_tools = AsyncMock(return_value=[make_mock_tool("tool1")])
+        assert len(await client.get_tools(mcp_client)) == 1
+
+    @pytest.mark.asyncio
+    async def test_connect_unwraps_transport_error_group(self):
+        client = MCPClient.from_mcp_server(make_mcp_server(name="test-server"))
+
+        @asynccontextmanager
+        async def open_session(name):
+            raise ExceptionGroup("task group", [httpx.ConnectError("Refused")])
+            yield
+
+        mcp_client = MagicMock()
+        mcp_client.session = open_session
+
+        with pytest.raises(MCPConnectionError, match="Failed to connect: Refused"):
+            await client.connect(mcp_client)
+        assert client._session_task is None
+
+    @pytest.mark.asyncio
+    async def test_connect_propagates_unexpected_errors(self):
+        client = MCPClient.from_mcp_server(make_mcp_server(name="test-server"))
+
+        @asynccontextmanager
+        async def open_session(name):
+            raise ValueError("bad config")
+            yield
+
+        mcp_client = MagicMock()
+        mcp_client.session = open_session
+
+        with pytest.raises(ValueError, match="bad config"):
+            await asyncio.wait_for(client.connect(mcp_client), timeout=1)
+        assert client._session_task is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_connect_stops_session_task(self):
+        client = MCPClient.from_mcp_server(make_mcp_server(name="test-server"))
+        entered = asyncio.Event()
+        exited = False
+
+        @asynccontextmanager
+        async def open_session(name):
+            nonlocal exited
+            entered.set()
+            try:
+                await asyncio.Event().wait()
+                yield
+            finally:
+                exited = True
+
+        mcp_client = MagicMock()
+        mcp_client.session = open_session
+
+        connecting = asyncio.create_task(client.connect(mcp_client))
+        await entered.wait()
+        connecting.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await connecting
+        assert exited
+        assert client._session_task is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_session_task_does_not_hang_connect(self):
+        client = MCPClient.from_mcp_server(make_mcp_server(name="test-server"))
+        entered = asyncio.Event()
+
+        @asynccontextmanager
+        async def open_session(name):
+            entered.set()
+            await asyncio.Event().wait()
+            yield
+
+        mcp_client = MagicMock()
+        mcp_client.session = open_session
+
+        connecting = asyncio.create_task(client.connect(mcp_client))
+        await entered.wait()
+        assert client._session_task is not None
+        client._session_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(connecting, timeout=1)
+        assert client._session_task is None
+
+    @pytest.mark.asyncio
+    async def test_dropped_session_can_reconnect(self):
+        client = MCPClient.from_mcp_server(make_mcp_server(name="test-server"))
+        opened = 0
+
+        @asynccontextmanager
+        async def open_session(name):
+            nonlocal opened
+            opened += 1
+            yield object()
+            if opened == 1:
+                raise httpx.RemoteProtocolError("Server disconnected")
+
+        mcp_client = MagicMock()
+        mcp_client.session = open_session
+        on_close = MagicMock()
+
+        await client.connect(mcp_client, on_close)
+        task = client._session_task
+        assert task is not None
+        # The first session fails with a transport error as it ends
+        client._close_session.set()
+        await task
+
+        assert client._session is None
+        assert client._session_task is None
+        on_close.assert_called_once()
+
+        await client.connect(mcp_client, on_close)
+        assert opened == 2
+        await client.aclose()
+
 
 class TestMCPManager:
     def test_from_afm_with_no_tools_returns_none(self):
@@ -421,6 +628,192 @@ class TestMCPManager:
         assert tools[0].name == "tool1"
         assert tools[1].name == "tool2"
 
+    @pytest.mark.asyncio
+    async def test_get_tools_shares_one_mcp_client(self):
+        servers = [
+            make_mcp_server(name="server1"),
+            make_stdio_mcp_server(name="server2"),
+        ]
+        manager = MCPManager(servers)
+
+        with patch("afm_langchain.tools.mcp.MultiServerMCPClient") as MockClient:
+            mock_instance = AsyncMock()
+            mock_instance.get_tools.return_value = [make_mock_tool("tool1")]
+            MockClient.return_value = mock_instance
+
+            await manager.get_tools()
+            manager.clear_cache()
+            await manager.get_tools()
+
+        MockClient.assert_called_once()
+        assert set(MockClient.call_args.args[0]) == {"server1", "server2"}
+        assert [c.kwargs for c in mock_instance.get_tools.call_args_list] == [
+            {"server_name": "server1"},
+            {"server_name": "server2"},
+        ] * 2
+
+    @pytest.mark.asyncio
+    async def test_http_servers_share_one_connection_pool(self):
+        servers = [
+            make_mcp_server(name="server1"),
+            make_mcp_server(name="server2", auth_type="bearer"),
+            make_stdio_mcp_server(name="server3"),
+        ]
+        manager = MCPManager(servers)
+
+        with patch("afm_langchain.tools.mcp.MultiServerMCPClient") as MockClient:
+            manager._get_mcp_client()
+        configs = MockClient.call_args.args[0]
+
+        assert "httpx_client_factory" not in configs["server3"]
+        first = configs["server1"]["httpx_client_factory"]()
+        second = configs["server2"]["httpx_client_factory"](auth=BearerAuth("t"))
+        assert first._transport is second._transport
+
+        # Closing a session's client leaves the pool open for the others
+        with patch.object(manager._http_pool, "aclose") as pool_aclose:
+            await first.aclose()
+            await second.aclose()
+            pool_aclose.assert_not_called()
+
+            await manager.aclose()
+
+        pool_aclose.assert_awaited_once()
+        assert manager._http_pool is None
+        assert manager._mcp_client is None
+
+    @pytest.mark.asyncio
+    async def test_get_tools_queries_servers_concurrently(self):
+        servers = [
+            make_mcp_server(name="server1"),
+            make_mcp_server(name="server2"),
+        ]
+        manager = MCPManager(servers)
+        second_started = asyncio.Event()
+
+        async def first_get_tools(*args):
+            # Only finishes if the second server is queried meanwhile
+            await asyncio.wait_for(second_started.wait(), timeout=1)
+            return [make_mock_tool("tool1")]
+
+        async def second_get_tools(*args):
+            second_started.set()
+            return [make_mock_tool("tool2")]
+
+        with (
+            patch.object(manager._clients[0], "get_tools", first_get_tools),
+            patch.object(manager._clients[1], "get_tools", second_get_tools),
+        ):
+            tools = await manager.get_tools()
+
+        assert [tool.name for tool in tools] == ["tool1", "tool2"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_tools_share_one_fetch(self):
+        manager = MCPManager([make_mcp_server(name="server1")])
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_get_tools(*args):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return [make_mock_tool("tool1")]
+
+        with patch.object(manager._clients[0], "get_tools", slow_get_tools):
+            first = asyncio.create_task(manager.get_tools())
+            second = asyncio.create_task(manager.get_tools())
+            await asyncio.sleep(0)
+            release.set()
+            tools1, tools2 = await asyncio.gather(first, second)
+
+        assert calls == 1
+        assert tools1 is tools2
+
+    @pytest.mark.asyncio
+    async def test_get_tools_propagates_auth_errors(self):
+        manager = MCPManager([make_mcp_server(name="server1")])
+
+        with (
+            patch.object(
+                manager._clients[0],
+                "get_tools",
+                side_effect=MCPAuthenticationError("Bad credentials"),
+            ),
+            pytest.raises(MCPAuthenticationError),
+        ):
+            await manager.get_tools()
+
+    @pytest.mark.asyncio
+    async def test_connect_skips_unreachable_servers(self):
+        manager = MCPManager(
+            [make_mcp_server(name="server1"), make_mcp_server(name="server2")]
+        )
+
+        with (
+            patch("afm_langchain.tools.mcp.MultiServerMCPClient"),
+            patch.object(manager._clients[0], "connect") as first_connect,
+            patch.object(
+                manager._clients[1],
+                "connect",
+                side_effect=MCPConnectionError("Refused", server_name="server2"),
+            ),
+        ):
+            await manager.connect()
+
+        first_connect.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_connect_raises_if_no_server_is_reachable(self):
+        manager = MCPManager(
+            [make_mcp_server(name="server1"), make_mcp_server(name="server2")]
+        )
+
+        with (
+            patch("afm_langchain.tools.mcp.MultiServerMCPClient"),
+            patch.object(
+                manager._clients[0],
+                "connect",
+                side_effect=MCPConnectionError("Refused", server_name="server1"),
+            ),
+            patch.object(
+                manager._clients[1],
+                "connect",
+                side_effect=MCPConnectionError("Refused", server_name="server2"),
+            ),
+            pytest.raises(
+                MCPConnectionError, match="Failed to connect to any MCP server"
+            ),
+        ):
+            await manager.connect()
+
+    @pytest.mark.asyncio
+    async def test_closed_session_drops_tools_and_reconnects(self):
+        manager = MCPManager([make_mcp_server(name="server1")])
+        client = manager._clients[0]
+        tool = make_mock_tool("tool1")
+
+        with (
+            patch("afm_langchain.tools.mcp._RETRY_INITIAL_DELAY", 0),
+            patch("afm_langchain.tools.mcp.MultiServerMCPClient"),
+            patch.object(client, "connect") as connect,
+            patch.object(client, "get_tools", return_value=[tool]),
+        ):
+            await manager.connect()
+            on_close = connect.call_args.args[1]
+            assert await manager.get_tools() == [tool]
+
+            # The session task reports the closed session to the manager
+            on_close()
+            assert manager.tools == []
+
+            assert manager._retry_task is not None
+            await manager._retry_task
+            assert manager.tools == [tool]
+            await manager.aclose()
+
+        assert connect.call_count == 2
+
     @pytest.mark.asyncio
     async def test_get_tools_caches_result(self):
         servers = [make_mcp_server(name="server1")]
@@ -458,6 +851,7 @@ class TestMCPManager:
             ),
         ):
             tools = await manager.get_tools()
+            await manager.aclose()
 
         assert len(tools) == 1
         assert tools[0].name == "tool2"
@@ -496,45 +890,118 @@ class TestMCPManager:
         assert manager._tools is None
 
     @pytest.mark.asyncio
-    async def test_get_tools_partial_failure_not_cached(self):
+    async def test_get_tools_partial_result_cached_and_failed_server_retried(self):
+        servers = [
+            make_mcp_server(name="server1"),
+            make_mcp_server(name="server2"),
+        ]
+        manager = MCPManager(servers)
+        get_tools2 = AsyncMock(
+            side_effect=[
+                MCPConnectionError("Connection failed", server_name="server2"),
+                [make_mock_tool("tool2")],
+            ]
+        )
+
+        with (
+            patch("afm_langchain.tools.mcp._RETRY_INITIAL_DELAY", 0),
+            patch.object(
+                manager._clients[0], "get_tools", return_value=[make_mock_tool("tool1")]
+            ) as get_tools1,
+            patch.object(manager._clients[1], "get_tools", get_tools2),
+        ):
+            tools = await manager.get_tools()
+            assert [tool.name for tool in tools] == ["tool1"]
+            # The partial result is cached; the retry happens in the background
+            assert await manager.get_tools() is tools
+
+            assert manager._retry_task is not None
+            await manager._retry_task
+
+        assert [tool.name for tool in manager.tools] == ["tool1", "tool2"]
+        get_tools1.assert_called_once()
+        assert get_tools2.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_server_retried_with_backoff(self):
         servers = [
             make_mcp_server(name="server1"),
             make_mcp_server(name="server2"),
         ]
         manager = MCPManager(servers)
+        refused = MCPConnectionError("Connection failed", server_name="server2")
+        get_tools2 = AsyncMock(
+            side_effect=[refused, refused, refused, [make_mock_tool("tool2")]]
+        )
 
-        # First call: server1 succeeds, server2 fails
         with (
             patch.object(
                 manager._clients[0], "get_tools", return_value=[make_mock_tool("tool1")]
             ),
+            patch.object(manager._clients[1], "get_tools", get_tools2),
+            patch("afm_langchain.tools.mcp.asyncio.sleep") as sleep,
+        ):
+            await manager.get_tools()
+            assert manager._retry_task is not None
+            await manager._retry_task
+
+        assert [call.args[0] for call in sleep.call_args_list] == [1.0, 2.0, 4.0]
+        assert [tool.name for tool in manager.tools] == ["tool1", "tool2"]
+
+    @pytest.mark.asyncio
+    async def test_auth_error_on_retry_stops_retrying(self):
+        servers = [
+            make_mcp_server(name="server1"),
+            make_mcp_server(name="server2"),
+        ]
+        manager = MCPManager(servers)
+        get_tools2 = AsyncMock(
+            side_effect=[
+                MCPConnectionError("Connection failed", server_name="server2"),
+                MCPAuthenticationError("Bad credentials"),
+            ]
+        )
+
+        with (
+            patch("afm_langchain.tools.mcp._RETRY_INITIAL_DELAY", 0),
             patch.object(
-                manager._clients[1],
-                "get_tools",
-                side_effect=MCPConnectionError(
-                    "Connection failed", server_name="server2"
-                ),
+                manager._clients[0], "get_tools", return_value=[make_mock_tool("tool1")]
             ),
+            patch.object(manager._clients[1], "get_tools", get_tools2),
         ):
-            tools = await manager.get_tools()
-            assert len(tools) == 1
-            assert tools[0].name == "tool1"
+            await manager.get_tools()
+            assert manager._retry_task is not None
+            await manager._retry_task
+
+        assert get_tools2.call_count == 2
+        assert [tool.name for tool in manager.tools] == ["tool1"]
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_pending_retry(self):
+        servers = [
+            make_mcp_server(name="server1"),
+            make_mcp_server(name="server2"),
+        ]
+        manager = MCPManager(servers)
 
-        # Second call: both succeed (server2 recovered)
         with (
             patch.object(
                 manager._clients[0], "get_tools", return_value=[make_mock_tool("tool1")]
-            ) as mock_get1_retry,
+            ),
             patch.object(
-                manager._clients[1], "get_tools", return_value=[make_mock_tool("tool2")]
-            ) as mock_get2_retry,
+                manager._clients[1],
+                "get_tools",
+                side_effect=MCPConnectionError("Refused", server_name="server2"),
+            ),
         ):
-            tools = await manager.get_tools()
-            assert len(tools) == 2
-            assert tools[0].name == "tool1"
-            assert tools[1].name == "tool2"
-            mock_get1_retry.assert_called_once()
-            mock_get2_retry.assert_called_once()
+            await manager.get_tools()
+            retry_task = manager._retry_task
+            assert retry_task is not None
+
+            await manager.aclose()
+
+        assert retry_task.cancelled()
+        assert manager._retry_task is None
 
     @pytest.mark.asyncio
     async def test_get_tools_mixed_http_and_stdio_servers(self):